@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from mock import Mock
 
 from tests import create_status, create_direct_message
 
 from turses.models import Timeline
 from turses.api.base import AsyncApi
 from turses.api.debug import MockApi
-from turses.api.backends import TweepyApi
+from turses.api.backends import TweepyApi, _to_status, _unescape
+from turses.api.ratelimit import (
+    INTERACTIVE_RESERVE,
+    RateLimited,
+    RateLimiter,
+    background_requests,
+)
 from turses.api.helpers import (
     TimelineFactory,
 
@@ -34,6 +44,19 @@ class AsyncApiTest(unittest.TestCase):
                  access_token_key=ACCESS_TOKEN,
                  access_token_secret=ACCESS_TOKEN_SECRET,)
 
+    def test_authenticated_user_is_cached(self):
+        api = AsyncApi(MockApi,
+                       access_token_key=ACCESS_TOKEN,
+                       access_token_secret=ACCESS_TOKEN_SECRET,)
+        api.init_api()
+        user = api.user
+
+        self.assertIs(api.verify_credentials(), user)
+
+        api.invalidate_user()
+
+        self.assertIsNot(api.verify_credentials(), user)
+
 
 class MockApiTest(unittest.TestCase):
     def test_that_implements_abstract_base_class(self):
@@ -46,6 +69,120 @@ class TweepyApiTest(unittest.TestCase):
         TweepyApi(access_token_key=ACCESS_TOKEN,
                   access_token_secret=ACCESS_TOKEN_SECRET,)
 
+    def test_verify_credentials_is_cached(self):
+        api = TweepyApi(access_token_key=ACCESS_TOKEN,
+                        access_token_secret=ACCESS_TOKEN_SECRET,)
+        api._verify_credentials = Mock()
+
+        api.verify_credentials()
+        api.verify_credentials()
+        self.assertEqual(api._verify_credentials.call_count, 1)
+
+        api.invalidate_user()
+        api.verify_credentials()
+        self.assertEqual(api._verify_credentials.call_count, 2)
+
+
+class ConversionTest(unittest.TestCase):
+    def test_unescape(self):
+        text = 'Fish &amp; chips &lt;3 #food &#8230; @dialelo'
+
+        self.assertEqual(_unescape(text),
+                         'Fish & chips <3 #food \u2026 @dialelo')
+
+    def test_unescape_without_html_entities(self):
+        self.assertEqual(_unescape('#food & drinks'), '#food & drinks')
+
+    def test_statuses_are_unescaped(self):
+        # Twitter computes the indices of the entities on the unescaped text
+        tweet = SimpleNamespace(id=1,
+                                created_at=datetime(2012, 12, 19),
+                                text='Q&amp;A with @dialelo &amp; #turses',
+                                entities={
+                                    'user_mentions': [
+                                        {'indices': [9, 17],
+                                         'screen_name': 'dialelo'}],
+                                    'hashtags': [
+                                        {'indices': [20, 27],
+                                         'text': 'turses'}],
+                                })
+
+        status = _to_status(tweet)
+
+        self.assertEqual(status.text, 'Q&A with @dialelo & #turses')
+        self.assertEqual(status.mentioned_usernames, ['dialelo'])
+        self.assertEqual(status.hashtags, ['#turses'])
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000
+        self.rate_limiter = RateLimiter(clock=lambda: self.now)
+
+    def wait_time(self, background=False):
+        return self.rate_limiter._wait_time('search/tweets', background)
+
+    def test_unknown_quota_does_not_wait(self):
+        self.assertEqual(self.wait_time(), 0)
+        self.assertEqual(self.wait_time(background=True), 0)
+
+    def test_quota_is_recorded_after_calls(self):
+        rate_limit = Mock(return_value=('search/tweets', 180, 179, 1900))
+        self.rate_limiter.rate_limit = rate_limit
+
+        result = self.rate_limiter.call('search/tweets', lambda: 42)
+
+        self.assertEqual(result, 42)
+        quota = self.rate_limiter.quotas()['search/tweets']
+        self.assertEqual((quota.limit, quota.remaining, quota.reset),
+                         (180, 179, 1900))
+
+    def test_exhausted_quota_waits_until_reset(self):
+        self.rate_limiter.update('search/tweets', 180, 0, 1900)
+
+        self.assertEqual(self.wait_time(), 900)
+
+        self.now = 1900
+        self.assertEqual(self.wait_time(), 0)
+
+    def test_rate_limited_requests_fail_right_away(self):
+        self.rate_limiter.update('search/tweets', 180, 0, 1900)
+        func = Mock()
+
+        with self.assertRaises(RateLimited) as context:
+            self.rate_limiter.call('search/tweets', func)
+
+        self.assertEqual(context.exception.endpoint, 'search/tweets')
+        self.assertEqual(context.exception.retry_at, 1900)
+        self.assertFalse(func.called)
+
+    def test_background_requests_are_spaced_out(self):
+        remaining = 10 + INTERACTIVE_RESERVE
+        self.rate_limiter.update('search/tweets', 180, remaining, 1100)
+        self.rate_limiter._last_request['search/tweets'] = self.now
+
+        self.assertEqual(self.wait_time(background=True), 10)
+        self.assertEqual(self.wait_time(), 0)
+
+    def test_background_requests_leave_interactive_reserve(self):
+        self.rate_limiter.update('search/tweets', 180, INTERACTIVE_RESERVE,
+                                 1100)
+
+        self.assertEqual(self.wait_time(background=True), 100)
+        self.assertEqual(self.wait_time(), 0)
+
+    def test_background_requests_context(self):
+        self.rate_limiter.update('search/tweets', 180, INTERACTIVE_RESERVE,
+                                 1100)
+
+        with background_requests():
+            self.assertRaises(RateLimited,
+                              self.rate_limiter.acquire, 'search/tweets')
+        self.rate_limiter.acquire('search/tweets')
+
+        quota = self.rate_limiter.quotas()['search/tweets']
+        self.assertEqual(quota.remaining, INTERACTIVE_RESERVE - 1)
+
 
 class HelperFunctionTest(unittest.TestCase):
     def test_is_home_timeline(self):
@@ -178,6 +315,27 @@ class TimelineFactoryTest(unittest.TestCase):
         self.created_timeline_verifies('retweets_of_me',
                                        is_retweets_of_me_timeline)
 
+    def test_created_timelines_poll_with_the_page_size(self):
+        self.assertEqual(self.factory('home').newer_cursor().count, 20)
+        self.assertEqual(self.factory('search:turses').newer_cursor().count,
+                         15)
+        self.assertIsNone(self.factory('messages').newer_cursor().count)
+
+    def test_favorites_and_retweets_of_me_are_polled_without_since_id(self):
+        for name in ('favorites', 'retweets_of_me'):
+            timeline = self.factory(name)
+            timeline.add_status(create_status(id=42))
+
+            cursor = timeline.newer_cursor()
+
+            self.assertEqual(cursor.as_kwargs(), {'count': 20})
+            self.assertFalse(cursor.is_polling)
+
+    def test_thread_is_fetched_without_cursor(self):
+        thread_timeline = self.factory.thread(create_status())
+
+        self.assertIsNone(thread_timeline.newer_cursor())
+
     def test_thread(self):
         status = create_status()
 
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks that report how much memory and time ``turses`` spends on some of
+its hot paths. They are slow and their results depend on the machine, so they
+only run when the ``TURSES_BENCHMARKS`` environment variable is set:
+
+.. code-block:: sh
+
+    $ make benchmark
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+import tracemalloc
+from datetime import datetime, timedelta
+
+from mock import Mock
+
+from turses.api.debug import MockApi
+from turses.core import Controller
+from turses.models import Status, Timeline, TimelineList
+from turses.ui import parse_attributes
+
+
+benchmark = unittest.skipUnless(os.environ.get('TURSES_BENCHMARKS'),
+                                'set TURSES_BENCHMARKS to run the benchmarks')
+
+
+def report(message, *args):
+    sys.stderr.write('\n' + message.format(*args) + '\n')
+
+
+def synthetic_tweets(quantity):
+    """
+    Yield the fields of `quantity` statuses that resemble the ones fetched
+    from Twitter, with user mentions, hashtags and URLs.
+    """
+    created_at = datetime(2012, 12, 19)
+    text = ('@dialelo I love #Python and #urwid, look at this: '
+            'http://t.co/5lTGNzba')
+    for id_num in range(quantity):
+        entities = {
+            'user_mentions': [
+                {'id': 87322884,
+                 'id_str': '87322884',
+                 'indices': [0, 8],
+                 'name': 'Alejandro Gómez',
+                 'screen_name': 'dialelo'},
+            ],
+            'hashtags': [
+                {'indices': [16, 23], 'text': 'Python'},
+                {'indices': [28, 34], 'text': 'urwid'},
+            ],
+            'urls': [
+                {'url': 'http://t.co/5lTGNzba',
+                 'indices': [51, 71],
+                 'expanded_url': 'https://github.com/louipc/turses',
+                 'display_url': 'github.com/louipc/turses'},
+            ],
+            'symbols': [],
+        }
+        yield dict(id=id_num,
+                   created_at=created_at + timedelta(seconds=id_num),
+                   user='turses',
+                   text=text,
+                   entities=entities)
+
+
+class LegacyStatus(object):
+    """
+    A status as it was represented before the models used ``__slots__`` and
+    compacted their entities: an instance dictionary holding every field and
+    the whole `entities` dictionary returned by Twitter.
+    """
+
+    def __init__(self, id, created_at, user, text, entities=None):
+        self.id = id
+        self.created_at = created_at
+        self.user = user
+        self.text = text
+        self.is_reply = False
+        self.is_retweet = False
+        self.is_favorite = False
+        self.retweet_count = 0
+        self.retweeted_status = None
+        self.author = ''
+        self.entities = {} if entities is None else entities
+
+
+def traced_bytes(function):
+    """Return the result of `function` and the memory allocated by it."""
+    tracemalloc.start()
+    try:
+        result = function()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+@benchmark
+class MemoryBenchmark(unittest.TestCase):
+    """
+    Compare the memory needed for holding statuses with the memory needed by
+    their legacy representation.
+    """
+
+    STATUSES = 100000
+
+    def test_bytes_per_status(self):
+        def legacy_statuses():
+            return [LegacyStatus(**fields)
+                    for fields in synthetic_tweets(self.STATUSES)]
+
+        def timeline_list():
+            timeline_list = TimelineList()
+            timeline = Timeline(name='benchmark')
+            timeline.add_statuses([Status(**fields)
+                                   for fields in synthetic_tweets(
+                                       self.STATUSES)])
+            timeline_list.append_timeline(timeline)
+            return timeline_list
+
+        legacy, legacy_size = traced_bytes(legacy_statuses)
+        timelines, size = traced_bytes(timeline_list)
+
+        report('{0:.0f} bytes per status ({1:.0f} before)',
+               size / self.STATUSES, legacy_size / self.STATUSES)
+        self.assertEqual(len(legacy), self.STATUSES)
+        self.assertEqual(len(timelines.active), self.STATUSES)
+        self.assertLess(size, legacy_size)
+
+
+@benchmark
+class ParseAttributesBenchmark(unittest.TestCase):
+    """
+    Measure the time needed for parsing the attributes of the text of
+    statuses without entities.
+    """
+
+    TWEETS = [
+        ('@aaloy  QT @Pybonacci: \xa1Qu\xe9 pasada con Vim! #Python #IDE RT '
+         '@dialelo uso un setup parecido a este: http://t.co/5lTGNzba'),
+        ('New release of #Turses 0.1.6 with lots of improvements, ncurses '
+         'twitter client. https://t.co/cciH85AG via @dialelo'),
+        'Just landed in Berlin, anyone up for a beer tonight? #pyconde',
+        ('RT @nedbat: Coverage.py 7.0 is out, thanks to everyone who helped '
+         'https://t.co/Vq3xWp8sLc #Python #testing'),
+        '@dialelo @mental_floss thanks!\n\nSee you at the sprints',
+    ]
+    ITERATIONS = 2000
+
+    def test_seconds_per_tweet(self):
+        start = time.perf_counter()
+        for _ in range(self.ITERATIONS):
+            for tweet in self.TWEETS:
+                parse_attributes(tweet)
+        elapsed = time.perf_counter() - start
+
+        seconds_per_tweet = elapsed / (self.ITERATIONS * len(self.TWEETS))
+        report('{0:.1f}us per tweet', seconds_per_tweet * 1e6)
+
+
+class SlowAuthenticationApi(MockApi):
+    """A `MockApi` that takes `AUTHENTICATION_TIME` seconds to authenticate."""
+
+    AUTHENTICATION_TIME = 0.5
+
+    def init_api(self):
+        time.sleep(self.AUTHENTICATION_TIME)
+        self.is_authenticated = True
+
+
+@benchmark
+class StartupBenchmark(unittest.TestCase):
+    """
+    Measure the CPU time consumed while waiting for the authentication of the
+    API, until the first timeline is drawn.
+    """
+
+    def test_cpu_time_before_first_draw(self):
+        drawn = threading.Event()
+        ui = Mock()
+        ui.draw_timelines.side_effect = lambda timelines: drawn.set()
+        api = SlowAuthenticationApi('foo', 'bar')
+        controller = Controller(ui=ui, api=api, timelines=TimelineList())
+
+        wall_start = time.monotonic()
+        cpu_start = time.process_time()
+
+        threading.Thread(target=api.init_api).start()
+        controller.init_timelines()
+        self.assertTrue(drawn.wait(timeout=10))
+
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.monotonic() - wall_start
+        report('{0:.3f}s CPU time in {1:.3f}s before the first draw',
+               cpu_time, wall_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+
+from tests import create_status, create_direct_message
+from turses.cache import SCHEMA_VERSION, StatusCache
+
+
+class StatusCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = os.path.join(directory, 'cache')
+        self.cache = StatusCache(self.filename, 'defaults', size=2)
+
+    def test_empty_cache(self):
+        self.assertEqual(self.cache.load(), {})
+
+    def test_statuses_are_restored(self):
+        status = create_status(id=1,
+                               text='I love #Python',
+                               entities={'hashtags': [{'indices': [7, 14],
+                                                       'text': 'Python'}]})
+        status.read = True
+        message = create_direct_message(id=2)
+
+        self.cache.save({'home': [status], 'messages': [message]})
+        cached = self.cache.load()
+
+        restored, = cached['home']
+        self.assertEqual(restored.id, 1)
+        self.assertEqual(restored.text, status.text)
+        self.assertEqual(restored.spans, status.spans)
+        self.assertTrue(restored.read)
+        restored_message, = cached['messages']
+        self.assertEqual(restored_message.sender_screen_name, 'Alice')
+        self.assertFalse(restored_message.read)
+
+    def test_retweets_and_urls_are_restored(self):
+        retweeted = create_status(
+            id=1,
+            user='dialelo',
+            text='Look: http://t.co/5lTGNzba',
+            entities={'urls': [{'indices': [6, 26],
+                                'url': 'http://t.co/5lTGNzba',
+                                'display_url': 'dialelo.com',
+                                'expanded_url': 'http://dialelo.com'}]})
+        retweet = create_status(id=2,
+                                text=retweeted.text,
+                                is_retweet=True,
+                                retweeted_status=retweeted,
+                                entities={})
+
+        self.cache.save({'home': [retweet]})
+        restored, = self.cache.load()['home']
+
+        self.assertTrue(restored.is_retweet)
+        self.assertEqual(restored.authors_username, 'dialelo')
+        self.assertEqual(restored.retweeted_status.spans, retweeted.spans)
+        self.assertEqual(restored.created_at, retweet.created_at)
+
+    def test_cache_of_other_schema_version_is_discarded(self):
+        with closing(sqlite3.connect(self.filename)) as connection:
+            connection.execute('CREATE TABLE statuses (session, timeline, '
+                               'id, status BLOB)')
+            connection.execute("INSERT INTO statuses VALUES "
+                               "('defaults', 'home', 1, x'80')")
+            connection.execute('PRAGMA user_version = %d' %
+                               (SCHEMA_VERSION + 1))
+            connection.commit()
+
+        self.assertEqual(self.cache.load(), {})
+
+        self.cache.save({'home': [create_status(id=2)]})
+        self.assertEqual(self.cache.load()['home'][0].id, 2)
+
+    def test_newest_statuses_are_kept(self):
+        statuses = [create_status(id=id_num) for id_num in (1, 2, 3)]
+
+        self.cache.save({'home': statuses})
+
+        self.assertEqual([status.id for status in self.cache.load()['home']],
+                         [3, 2])
+
+    def test_saving_replaces_the_session_timelines(self):
+        self.cache.save({'home': [create_status(id=1)],
+                         'mentions': [create_status(id=2)]})
+        self.cache.save({'home': [create_status(id=3)]})
+
+        cached = self.cache.load()
+
+        self.assertEqual(list(cached), ['home'])
+        self.assertEqual([status.id for status in cached['home']], [3])
+
+    def test_sessions_are_cached_separately(self):
+        other_session = StatusCache(self.filename, 'interactions', size=2)
+
+        self.cache.save({'home': [create_status(id=1)]})
+        other_session.save({'home': [create_status(id=2)]})
+
+        self.assertEqual(self.cache.load()['home'][0].id, 1)
+        self.assertEqual(other_session.load()['home'][0].id, 2)
+
+    def test_disabled_cache(self):
+        cache = StatusCache(self.filename, 'defaults', size=0)
+
+        cache.save({'home': [create_status()]})
+
+        self.assertEqual(cache.load(), {})
+        self.assertFalse(os.path.exists(self.filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from os.path import join
 
 from turses.config import (
     CONFIG_PATH,
+    DEFAULT_CACHE_FILE,
     DEFAULT_CONFIG_FILE,
     DEFAULT_TOKEN_FILE,
     PALETTE,
@@ -53,12 +54,15 @@ class ConfigurationTest(unittest.TestCase):
         # files
         self.assertEqual(config.config_file, DEFAULT_CONFIG_FILE)
         self.assertEqual(config.token_file, DEFAULT_TOKEN_FILE)
+        self.assertEqual(config.cache_file, DEFAULT_CACHE_FILE)
 
         # config options
         self.assertEqual(config.twitter['update_frequency'],
                          TWITTER['update_frequency'])
         self.assertEqual(config.twitter['use_https'],
                          TWITTER['use_https'])
+        self.assertEqual(config.twitter['timeline_capacity'],
+                         TWITTER['timeline_capacity'])
         self.assertEqual(config.key_bindings, KEY_BINDINGS)
         self.assertEqual(config.palette, PALETTE)
         self.assertEqual(config.styles, STYLES)
@@ -126,11 +130,13 @@ class ConfigurationTest(unittest.TestCase):
         account = 'bob'
         args = Args(account=account)
         token_path = join(CONFIG_PATH, "%s.token" % account)
+        cache_path = join(CONFIG_PATH, "%s.cache" % account)
 
         config = Configuration()
         config.parse_args(args)
 
         self.assertEqual(token_path, config.token_file)
+        self.assertEqual(cache_path, config.cache_file)
 
     def test_args_generate_config(self):
         config_path = '~/.turses/custom_config'
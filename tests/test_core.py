@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from mock import Mock
+import os
+import shutil
+import tempfile
+import threading
+from mock import Mock, patch
 import unittest
 
 from tests import create_status
-from turses.models import TimelineList
+from turses.models import Timeline, TimelineList
 from turses.api.helpers import (
     is_home_timeline,
     is_user_timeline,
@@ -13,9 +17,21 @@ from turses.api.helpers import (
     is_messages_timeline,
     is_thread_timeline,
 )
+from turses.api.ratelimit import RateLimited
 from turses.config import configuration
-from turses.core import InputHandler, Controller
+from turses.core import (
+    InputHandler,
+    Controller,
+    MainLoopDispatcher,
+    BACKGROUND_FACTOR,
+    CACHE_SAVE_INTERVAL,
+    MAX_BACKOFF,
+    PAGE_SIZE,
+    PollingScheduler,
+    RedrawScheduler,
+)
 from turses.api.debug import MockApi
+from turses.cache import StatusCache
 
 
 class InputHandlerTest(unittest.TestCase):
@@ -114,6 +130,159 @@ class InputHandlerTest(unittest.TestCase):
             self.controller.forward_to_editor.assert_called_with(key)
 
 
+def attach_loop(test_case, dispatcher):
+    read_fd, write_fd = os.pipe()
+    test_case.addCleanup(os.close, read_fd)
+    test_case.addCleanup(os.close, write_fd)
+    loop = Mock()
+    loop.watch_pipe.return_value = write_fd
+    dispatcher.attach(loop)
+    return loop, read_fd
+
+
+class MainLoopDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = MainLoopDispatcher()
+
+    def test_calls_right_away_without_loop(self):
+        func = Mock()
+
+        self.dispatcher.call(func, 1, foo='bar')
+
+        func.assert_called_once_with(1, foo='bar')
+        self.assertTrue(self.dispatcher.in_loop_thread())
+
+    def test_calls_are_executed_in_the_loop_thread(self):
+        _, read_fd = attach_loop(self, self.dispatcher)
+        calls = []
+
+        def worker():
+            calls.append(self.dispatcher.in_loop_thread())
+            self.dispatcher.call(calls.append, 'first')
+            self.dispatcher.call(calls.append, 'second')
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(calls, [False])
+
+        self.dispatcher._wake_up(os.read(read_fd, 1024))
+
+        self.assertEqual(calls, [False, 'first', 'second'])
+
+    def test_errors_do_not_stop_the_queue(self):
+        attach_loop(self, self.dispatcher)
+        func = Mock()
+
+        self.dispatcher.call(Mock(side_effect=Exception))
+        self.dispatcher.call(func)
+        self.dispatcher._wake_up(b'cc')
+
+        func.assert_called_once_with()
+
+
+class RedrawSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.redraw = Mock()
+        self.dispatcher = MainLoopDispatcher()
+        self.scheduler = RedrawScheduler(self.redraw, self.dispatcher)
+
+    def test_redraws_synchronously_without_loop(self):
+        self.scheduler.request()
+        self.scheduler.request()
+
+        self.assertEqual(self.redraw.call_count, 2)
+        self.assertFalse(self.scheduler.dirty)
+
+    def test_requests_are_coalesced(self):
+        _, read_fd = attach_loop(self, self.dispatcher)
+
+        self.scheduler.request()
+        self.scheduler.request()
+        self.assertFalse(self.redraw.called)
+
+        self.dispatcher._wake_up(os.read(read_fd, 1024))
+
+        self.redraw.assert_called_once_with()
+        self.assertFalse(self.scheduler.dirty)
+
+    def test_redraws_are_rate_limited(self):
+        loop, _ = attach_loop(self, self.dispatcher)
+        self.scheduler.request()
+        self.dispatcher._wake_up(b'c')
+
+        self.scheduler.request()
+        self.dispatcher._wake_up(b'c')
+
+        self.assertEqual(self.redraw.call_count, 1)
+        self.assertEqual(loop.set_alarm_in.call_count, 1)
+        delay, callback = loop.set_alarm_in.call_args[0]
+        self.assertLessEqual(delay, self.scheduler.frame_interval)
+
+        callback(loop, None)
+
+        self.assertEqual(self.redraw.call_count, 2)
+
+
+class PollingSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.update_frequency = configuration.twitter['update_frequency']
+        self.timelines = TimelineList()
+        self.visible = Timeline(name='visible')
+        self.background = Timeline(name='background')
+        self.timelines.append_timeline(self.visible)
+        self.timelines.append_timeline(self.background)
+        self.scheduler = PollingScheduler()
+
+    def test_new_timelines_are_scheduled(self):
+        self.assertEqual(self.scheduler.due_timelines(self.timelines, 0), [])
+        self.assertEqual(self.scheduler.next_poll(), self.update_frequency)
+
+    def test_background_timelines_are_updated_less_often(self):
+        self.scheduler.due_timelines(self.timelines, 0)
+
+        due = self.scheduler.due_timelines(self.timelines,
+                                           self.update_frequency)
+
+        self.assertEqual(due, [self.visible])
+        due = self.scheduler.due_timelines(
+            self.timelines, self.update_frequency * BACKGROUND_FACTOR)
+        self.assertIn(self.background, due)
+
+    def test_quiet_timelines_back_off(self):
+        for _ in range(10):
+            self.scheduler.polled(self.visible, 0, True, 0)
+
+        self.assertEqual(self.scheduler.interval(self.visible),
+                         self.update_frequency * MAX_BACKOFF)
+
+        self.scheduler.polled(self.visible, 1, True, 0)
+
+        self.assertEqual(self.scheduler.interval(self.visible),
+                         self.update_frequency)
+
+    def test_busy_timelines_are_updated_more_often(self):
+        self.scheduler.polled(self.visible, PAGE_SIZE, True, 0)
+
+        self.assertEqual(self.scheduler.interval(self.visible),
+                         self.update_frequency / 2)
+
+    def test_overrides(self):
+        scheduler = PollingScheduler(overrides={self.visible: 42})
+
+        scheduler.polled(self.visible, 0, True, 0)
+
+        self.assertEqual(scheduler.interval(self.visible), 42)
+        self.assertEqual(scheduler.next_poll(), 42)
+
+    def test_postpone(self):
+        self.scheduler.polled(self.visible, 1, True, 0)
+
+        self.scheduler.postpone(self.visible, 900)
+
+        self.assertEqual(self.scheduler.next_poll(), 900)
+
+
 class ControllerTest(unittest.TestCase):
     def setUp(self):
         self.timelines = TimelineList()
@@ -167,6 +336,287 @@ class ControllerTest(unittest.TestCase):
     # TODO: test `append_search_timeline`
     # TODO: test `append_retweets_of_me_timeline`
 
+    def test_favorite_marks_status_and_invalidates_its_rendering(self):
+        status = create_status()
+        self.controller.api = Mock()
+        self.controller.api.create_favorite.side_effect = (
+            lambda on_error, on_success, status: on_success())
+
+        self.controller._favorite(status)
+
+        self.assertTrue(status.is_favorite)
+        self.controller.ui.invalidate_status.assert_called_once_with(status)
+
+    def test_favorite_is_marked_in_the_loop_thread(self):
+        dispatcher = self.controller.dispatcher
+        _, read_fd = attach_loop(self, dispatcher)
+        status = create_status()
+        self.controller.api = Mock()
+
+        def create_favorite(on_error, on_success, status):
+            thread = threading.Thread(target=on_success)
+            thread.start()
+            thread.join()
+        self.controller.api.create_favorite.side_effect = create_favorite
+
+        self.controller._favorite(status)
+        self.assertFalse(status.is_favorite)
+        self.assertFalse(self.controller.ui.invalidate_status.called)
+
+        dispatcher._wake_up(os.read(read_fd, 1024))
+
+        self.assertTrue(status.is_favorite)
+        self.controller.ui.invalidate_status.assert_called_once_with(status)
+
+    def test_update_all_timelines_concurrently(self):
+        barrier = threading.Barrier(2, timeout=1)
+
+        def fetch(status_id):
+            barrier.wait()
+            return [create_status(id=status_id)]
+
+        timelines = TimelineList()
+        for status_id in (1, 2):
+            timelines.append_timeline(
+                Timeline(update_function=fetch,
+                         update_function_args=status_id))
+        self.controller.timelines = timelines
+
+        futures = self.controller.update_all_timelines()
+
+        self.assertEqual([future.result(timeout=1)[0] for future in futures],
+                         [1, 1])
+        self.assertEqual([timeline[0].id for timeline in timelines], [1, 2])
+
+    def test_update_all_timelines_fetches_newer_statuses(self):
+        old_status = create_status(id=2)
+        fetch = Mock(return_value=[create_status(id=3)])
+        timeline = Timeline(update_function=fetch, statuses=[old_status])
+        timelines = TimelineList()
+        timelines.append_timeline(timeline)
+        self.controller.timelines = timelines
+
+        future, = self.controller.update_all_timelines()
+        future.result(timeout=1)
+
+        fetch.assert_called_once_with(since_id=2)
+        self.assertEqual([status.id for status in timeline], [3, 2])
+
+    def test_polling_interval_adapts_to_the_new_statuses(self):
+        update_frequency = configuration.twitter['update_frequency']
+        statuses = [create_status(id=id_num)
+                    for id_num in range(1, 1 + PAGE_SIZE)]
+        known = Timeline(update_function=Mock(return_value=statuses),
+                         statuses=statuses)
+        thread = Timeline(update_function=Mock(
+            return_value=filter(None, [create_status(id=1)])))
+
+        futures = self.controller.update_timelines([known, thread])
+        for future in futures:
+            future.result(timeout=1)
+
+        polling = self.controller.polling
+        self.assertEqual(polling.interval(known), update_frequency * 2)
+        self.assertEqual(polling.interval(thread), update_frequency)
+        self.assertEqual(len(thread), 1)
+
+    def test_full_pages_are_backfilled(self):
+        old_status = create_status(id=2)
+        gap = [create_status(id=3)]
+        newest_page = [create_status(id=id_num)
+                       for id_num in range(4, 4 + PAGE_SIZE)]
+        pages = {None: newest_page, 3: gap}
+
+        def fetch(since_id, count, max_id=None):
+            return list(pages[max_id])
+
+        timeline = Timeline(update_function=fetch,
+                            statuses=[old_status],
+                            page_size=PAGE_SIZE)
+
+        fetched, _ = self.controller._update_timeline(
+            timeline, cursor=timeline.newer_cursor())
+
+        self.assertEqual(fetched, PAGE_SIZE + 1)
+
+        self.assertEqual(len(timeline), PAGE_SIZE + 2)
+        self.assertEqual(timeline[-2].id, 3)
+
+    def test_backfill_compares_with_the_page_size_of_the_timeline(self):
+        newest_page = [create_status(id=id_num) for id_num in range(4, 19)]
+        fetch = Mock(side_effect=[newest_page, []])
+        timeline = Timeline(update_function=fetch,
+                            statuses=[create_status(id=2)],
+                            page_size=15)
+
+        self.controller._update_timeline(timeline,
+                                         cursor=timeline.newer_cursor())
+
+        fetch.assert_called_with(since_id=2, max_id=3, count=15)
+
+    def test_timelines_without_page_size_are_not_backfilled(self):
+        merged_pages = [create_status(id=id_num)
+                        for id_num in range(4, 4 + 2 * PAGE_SIZE)]
+        fetch = Mock(return_value=merged_pages)
+        timeline = Timeline(update_function=fetch,
+                            statuses=[create_status(id=2)])
+
+        self.controller._update_timeline(timeline,
+                                         cursor=timeline.newer_cursor())
+
+        fetch.assert_called_once_with(since_id=2)
+
+    def test_rate_limited_background_updates_are_postponed(self):
+        fetch = Mock(side_effect=RateLimited('statuses/home_timeline', 900))
+        timeline = Timeline(update_function=fetch)
+
+        future, = self.controller.update_timelines([timeline],
+                                                   background=True)
+
+        self.assertIsInstance(future.exception(timeout=1), RateLimited)
+        self.assertEqual(self.controller.polling.next_poll(), 900)
+
+    def test_rate_limited_interactive_updates_fail_right_away(self):
+        fetch = Mock(side_effect=RateLimited('statuses/home_timeline', 900))
+        timeline = Timeline(update_function=fetch)
+
+        fetched, _ = self.controller._update_timeline(timeline)
+
+        self.assertIsNone(fetched)
+        self.assertTrue(self.controller.ui.status_error_message.called)
+
+    def test_user_info_is_fetched_in_a_worker(self):
+        self.timelines.active.add_status(create_status())
+        self.controller.api = Mock()
+        self.controller.api.get_user.side_effect = (
+            lambda username: threading.current_thread())
+
+        self.controller.user_info().result(timeout=1)
+
+        (user, _), _ = self.controller.ui.show_user_info.call_args
+        self.assertIsNot(user, threading.current_thread())
+        self.assertTrue(self.controller.is_in_user_info_mode())
+
+    def test_update_timeline_reports_the_time_spent_fetching(self):
+        timeline = Timeline(update_function=Mock(return_value=[]))
+
+        with patch('turses.core.time', side_effect=[10, 12.5]):
+            result = self.controller._update_timeline(timeline)
+
+        self.assertEqual(result, (0, 2.5))
+
+    def test_statuses_are_added_in_the_loop_thread(self):
+        dispatcher = self.controller.dispatcher
+        _, read_fd = attach_loop(self, dispatcher)
+        timeline = self.timelines.active
+        timeline.update_function = Mock(return_value=[create_status()])
+
+        thread = threading.Thread(target=self.controller._update_timeline,
+                                  args=(timeline,))
+        thread.start()
+        thread.join()
+        self.assertEqual(len(timeline), 0)
+
+        dispatcher._wake_up(os.read(read_fd, 1024))
+
+        self.assertEqual(len(timeline), 1)
+
+    def test_init_timelines_fetches_visible_timelines_first(self):
+        barrier = threading.Barrier(2, timeout=1)
+        buffer_fetched = threading.Event()
+        visible_fetched = []
+
+        def fetch_visible(status_id):
+            barrier.wait()
+            visible_fetched.append(status_id)
+            return [create_status(id=status_id)]
+
+        def fetch_buffer():
+            self.assertEqual(sorted(visible_fetched), [1, 2])
+            buffer_fetched.set()
+            return [create_status(id=3)]
+
+        timelines = TimelineList()
+        for status_id in (1, 2):
+            timelines.append_timeline(
+                Timeline(update_function=fetch_visible,
+                         update_function_args=status_id))
+        timelines.append_timeline(Timeline(update_function=fetch_buffer))
+        timelines.expand_visible_next()
+        self.controller.timelines = timelines
+        self.controller.api.is_authenticated = True
+        self.controller.info_mode()
+
+        self.controller.init_timelines().result(timeout=1)
+
+        self.assertTrue(buffer_fetched.wait(timeout=1))
+        self.assertTrue(self.controller.is_in_timeline_mode())
+        self.assertEqual([timeline[0].id for timeline in timelines[:2]],
+                         [1, 2])
+
+    def test_init_timelines_does_not_wait_in_the_worker(self):
+        fetched = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            fetched.set()
+            release.wait(timeout=1)
+            return []
+
+        timelines = TimelineList()
+        timelines.append_timeline(Timeline(update_function=fetch))
+        self.controller.timelines = timelines
+        self.controller.api.is_authenticated = True
+        self.addCleanup(release.set)
+
+        self.controller.init_timelines().result(timeout=1)
+
+        self.assertTrue(fetched.wait(timeout=1))
+
+    def test_cache_is_saved_periodically_from_a_worker(self):
+        saved = threading.Event()
+        timeline = self.timelines.active
+        timeline.add_status(create_status(id=1))
+        self.controller.session.timeline_names = {timeline: 'home'}
+        self.controller.cache = Mock()
+        self.controller.cache.save.side_effect = lambda statuses: saved.set()
+        self.controller.loop = Mock()
+
+        self.controller.cache_alarm()
+
+        self.assertTrue(saved.wait(timeout=1))
+        (statuses,), _ = self.controller.cache.save.call_args
+        self.assertEqual([status.id for status in statuses['home']], [1])
+        self.controller.loop.set_alarm_in.assert_called_once_with(
+            CACHE_SAVE_INTERVAL, self.controller.cache_alarm)
+
+    def test_cached_statuses_are_shown_and_only_newer_ones_fetched(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = StatusCache(os.path.join(directory, 'cache'), 'defaults', 10)
+        cache.save({'home': [create_status(id=2)]})
+        fetch = Mock(return_value=[create_status(id=3)])
+        timeline = Timeline(update_function=fetch)
+        timelines = TimelineList()
+        timelines.append_timeline(timeline)
+        self.controller.timelines = timelines
+        self.controller.session.timeline_names = {timeline: 'home'}
+        self.controller.cache = cache
+        self.controller.api.is_authenticated = True
+        initialized = threading.Event()
+        self.controller.update_alarm = initialized.set
+
+        self.controller.load_cache()
+        self.assertEqual([status.id for status in timeline], [2])
+
+        self.controller.init_timelines()
+        self.assertTrue(initialized.wait(timeout=1))
+        fetch.assert_called_once_with(since_id=2)
+
+        self.controller.save_cache()
+        self.assertEqual([status.id for status in cache.load()['home']],
+                         [3, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import unittest
+from threading import Event
 
 from mock import Mock
 
-from turses.meta import ActiveList, Observable, notify
+from turses.meta import (ActiveList, Cursor, Observable, Updatable,
+                         WorkerPool, notify)
 
 
 class ActiveListTest(unittest.TestCase):
@@ -50,5 +52,85 @@ class ObservableTest(unittest.TestCase):
         self.assertFalse(self.observer.update.called)
 
 
+class UpdatableStub(Updatable):
+    def update_callback(self, result):
+        self.result = result
+
+
+class UpdatableTest(unittest.TestCase):
+    def setUp(self):
+        self.update_function = Mock(return_value=[])
+        self.updatable = UpdatableStub(
+            update_function=self.update_function,
+            update_function_kwargs={'screen_name': 'dialelo'})
+
+    def test_cursor_parameters_are_passed(self):
+        self.updatable.update(Cursor(since_id=1, count=5))
+
+        self.update_function.assert_called_once_with(screen_name='dialelo',
+                                                     since_id=1,
+                                                     count=5)
+
+    def test_paging_parameters_do_not_stick(self):
+        self.updatable.update(Cursor(max_id=10))
+        self.updatable.update(since_id=5)
+        self.updatable.update()
+
+        self.assertEqual(self.update_function.call_args_list[1][1],
+                         {'screen_name': 'dialelo', 'since_id': 5})
+        self.update_function.assert_called_with(screen_name='dialelo')
+
+    def test_cursor_older_than(self):
+        cursor = Cursor(since_id=1, count=20).older_than(100)
+
+        self.assertEqual(cursor.as_kwargs(),
+                         {'since_id': 1, 'max_id': 99, 'count': 20})
+        self.assertFalse(cursor.is_polling)
+
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(size=2)
+
+    def test_submit_returns_future(self):
+        future = self.pool.submit(lambda x, y=0: x + y, 1, y=2)
+
+        self.assertEqual(future.result(timeout=1), 3)
+
+    def test_exceptions_are_set_in_future(self):
+        future = self.pool.submit(Mock(side_effect=ValueError))
+
+        self.assertIsInstance(future.exception(timeout=1), ValueError)
+
+    def test_pool_is_bounded(self):
+        release = Event()
+        futures = [self.pool.submit(release.wait) for _ in range(5)]
+
+        self.assertEqual(len(self.pool._threads), 2)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=1)
+
+    def test_submit_once_merges_calls_in_flight(self):
+        release = Event()
+        func = Mock(side_effect=lambda: release.wait())
+
+        future = self.pool.submit_once('key', func)
+        same_future = self.pool.submit_once('key', func)
+        release.set()
+        future.result(timeout=1)
+
+        self.assertIs(same_future, future)
+        func.assert_called_once_with()
+
+        # the key can be submitted again once the call has finished
+        other_future = self.pool.submit_once('key', func)
+        other_future.result(timeout=1)
+
+        self.assertIsNot(other_future, future)
+        self.assertEqual(func.call_count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,8 @@ from tests import create_status, create_direct_message
 from tests.test_meta import ActiveListTest
 
 from turses.utils import prepend_at
-from turses.models import is_DM, Timeline, TimelineList
+from turses.models import (is_DM, Timeline, TimelineList, PINNED_STATUSES,
+                           MENTION, HASHTAG, URL, relative_time)
 
 
 class StatusTest(unittest.TestCase):
@@ -122,6 +123,68 @@ class StatusTest(unittest.TestCase):
         mentioned_hashtags = status.hashtags
         self.assertEqual(expected, set(mentioned_hashtags))
 
+    def test_mentions_and_hashtags_from_entities(self):
+        entities = {
+            'hashtags': [{'indices': [18, 25], 'text': 'Python'}],
+            'user_mentions': [{'indices': [0, 8], 'screen_name': 'dialelo'},
+                              {'indices': [9, 17], 'screen_name': 'dialelo'}],
+        }
+        status = create_status(text='@dialelo @dialelo #Python is #great',
+                               entities=entities)
+
+        self.assertEqual(status.mentioned_usernames, ['dialelo'])
+        self.assertEqual(status.hashtags, ['#Python'])
+
+    def test_mentions_and_hashtags_are_copies(self):
+        status = create_status(text='@dialelo loves #Python')
+
+        status.mentioned_usernames.append('turses')
+        status.hashtags.append('#urwid')
+
+        self.assertEqual(status.mentioned_usernames, ['dialelo'])
+        self.assertEqual(status.hashtags, ['#Python'])
+
+    def test_created_at_is_stored_as_timestamp(self):
+        status = create_status(created_at=datetime(1970, 1, 2, 0, 0, 30))
+
+        self.assertEqual(status.created_at, 24 * 60 * 60 + 30)
+
+    def test_relative_time(self):
+        self.assertEqual(relative_time(0, 1), ('a second ago', 1.25))
+        self.assertEqual(relative_time(0, 30.5), ('30 seconds ago', 31))
+        self.assertEqual(relative_time(0, 47.5), ('47 seconds ago', 48))
+        self.assertEqual(relative_time(0, 60), ('a minute ago', 75))
+        self.assertEqual(relative_time(0, 150), ('2 minutes ago', 180))
+        self.assertEqual(relative_time(0, 3600), ('an hour ago', 4500))
+        self.assertEqual(relative_time(0, 7300), ('2 hours ago', 10800))
+        self.assertEqual(relative_time(0, 86400), ('a day ago', 108000))
+        self.assertEqual(relative_time(0, 200000), ('2 days ago', 259200))
+
+    def test_spans_are_sorted_by_position(self):
+        entities = {
+            'urls': [{'url': 'http://t.co/5lTGNzba',
+                      'indices': [22, 42],
+                      'expanded_url': 'https://github.com/louipc/turses',
+                      'display_url': 'github.com/louipc/turses'}],
+            'hashtags': [{'indices': [9, 16], 'text': 'Python'}],
+            'user_mentions': [{'indices': [0, 8], 'screen_name': 'dialelo'}],
+        }
+        status = create_status(text='@dialelo #Python look: '
+                                    'http://t.co/5lTGNzba',
+                               entities=entities)
+
+        self.assertEqual(status.spans,
+                         ((MENTION, 0, 8, None),
+                          (HASHTAG, 9, 16, None),
+                          (URL, 22, 42, ('http://t.co/5lTGNzba',
+                                         'github.com/louipc/turses',
+                                         'https://github.com/louipc/turses'))))
+
+    def test_no_spans_without_entities(self):
+        status = create_status(entities={'hashtags': [], 'urls': []})
+
+        self.assertIsNone(status.spans)
+
 
 class TimelineTest(ActiveListTest):
 
@@ -142,6 +205,24 @@ class TimelineTest(ActiveListTest):
 
         self.assertEqual(len(self.timeline), 1)
 
+    def test_status_in_timeline(self):
+        status = create_status(id=1)
+        another_status = create_status(id=2)
+
+        self.timeline.add_status(status)
+
+        self.assertTrue(status in self.timeline)
+        self.assertFalse(another_status in self.timeline)
+
+    def test_statuses_can_be_added_again_after_clear(self):
+        status = create_status()
+
+        self.timeline.add_status(status)
+        self.timeline.clear()
+        self.timeline.add_status(status)
+
+        self.assertEqual(len(self.timeline), 1)
+
     # active index
 
     def test_active_index_is_0_when_creating_timeline_with_statuses(self):
@@ -192,6 +273,45 @@ class TimelineTest(ActiveListTest):
 
         self.assertEqual(len(self.timeline), 2)
 
+    def test_insert_duplicated_statuses_in_the_same_batch(self):
+        status = create_status(id=1)
+        same_status = create_status(id=1)
+
+        self.timeline.add_statuses([status, same_status])
+
+        self.assertEqual(len(self.timeline), 1)
+
+    def test_add_statuses_returns_the_number_inserted(self):
+        self.timeline.add_status(create_status(id=1))
+
+        inserted = self.timeline.add_statuses(
+            iter([create_status(id=id_num) for id_num in (1, 2, 2, 3)]))
+
+        self.assertEqual(inserted, 2)
+        self.assertEqual(self.timeline.added_count, 3)
+        self.assertEqual(self.timeline.add_statuses([]), 0)
+
+    def test_active_status_is_kept_when_inserting_statuses(self):
+        old_status = create_status(id=1, created_at=datetime(1988, 12, 19))
+        self.timeline.add_status(old_status)
+
+        newer_statuses = [create_status(id=id_num) for id_num in range(2, 6)]
+        older_status = create_status(id=6, created_at=datetime(1970, 1, 1))
+        self.timeline.add_statuses(newer_statuses + [older_status])
+
+        self.assertEqual(len(self.timeline), 6)
+        self.assertEqual(self.timeline.active, old_status)
+        self.assertEqual(self.timeline.active_index, len(newer_statuses))
+
+    def test_inserting_statuses_notifies_once(self):
+        observer = MagicMock()
+        self.timeline.subscribe(observer)
+
+        statuses = [create_status(id=id_num) for id_num in range(1, 10)]
+        self.timeline.add_statuses(statuses)
+
+        observer.update.assert_called_once_with()
+
     # order
 
     def test_statuses_ordered_reversely_by_date(self):
@@ -208,6 +328,14 @@ class TimelineTest(ActiveListTest):
         self.assertEqual(self.timeline[0], new_status)
         self.assertEqual(self.timeline[1], old_status)
 
+    def test_newest_id(self):
+        self.assertIsNone(self.timeline.newest_id)
+
+        self.timeline.add_statuses([create_status(id=1),
+                                    create_status(id=2)])
+
+        self.assertEqual(self.timeline.newest_id, 2)
+
     # unread
 
     def test_unread_count(self):
@@ -229,6 +357,73 @@ class TimelineTest(ActiveListTest):
         self.timeline.mark_all_as_read()
         self.assertEqual(self.timeline.unread_count, 0)
 
+    def test_unread_count_follows_read_attribute_of_statuses(self):
+        status = create_status(id=1)
+        another_timeline = Timeline()
+        self.timeline.add_status(status)
+        another_timeline.add_status(status)
+
+        status.read = True
+        self.assertEqual(self.timeline.unread_count, 0)
+        self.assertEqual(another_timeline.unread_count, 0)
+
+        status.read = False
+        self.assertEqual(self.timeline.unread_count, 1)
+        self.assertEqual(another_timeline.unread_count, 1)
+
+    def test_unread_count_after_clear(self):
+        status = create_status(id=1)
+        self.timeline.add_status(status)
+
+        self.timeline.clear()
+        status.read = True
+
+        self.assertEqual(self.timeline.unread_count, 0)
+
+    # capacity
+
+    def test_read_statuses_are_evicted_when_exceeding_capacity(self):
+        capacity = PINNED_STATUSES + 5
+        self.timeline = Timeline(capacity=capacity)
+        statuses = [create_status(id=id_num)
+                    for id_num in range(capacity + 10)]
+        for status in statuses:
+            status.read = True
+
+        self.timeline.add_statuses(statuses)
+
+        self.assertEqual(len(self.timeline), capacity)
+        self.assertEqual(self.timeline.evicted_count, 10)
+        # the oldest statuses are the evicted ones
+        self.assertFalse(statuses[0] in self.timeline)
+        self.assertTrue(statuses[-1] in self.timeline)
+
+    def test_unread_statuses_are_not_evicted(self):
+        capacity = PINNED_STATUSES + 5
+        self.timeline = Timeline(capacity=capacity)
+        statuses = [create_status(id=id_num)
+                    for id_num in range(capacity + 10)]
+
+        self.timeline.add_statuses(statuses)
+
+        self.assertEqual(len(self.timeline), capacity + 10)
+        self.assertEqual(self.timeline.evicted_count, 0)
+
+    def test_active_status_neighbourhood_is_not_evicted(self):
+        capacity = PINNED_STATUSES + 5
+        self.timeline = Timeline(capacity=capacity)
+        statuses = [create_status(id=id_num) for id_num in range(capacity)]
+        for status in statuses:
+            status.read = True
+        self.timeline.add_statuses(statuses)
+        self.timeline.activate_last()
+        active = self.timeline.active
+
+        self.timeline.add_statuses([create_status(id=capacity)])
+
+        self.assertEqual(self.timeline.evicted_count, 0)
+        self.assertEqual(self.timeline.active, active)
+
     # clear
 
     def test_clear(self):
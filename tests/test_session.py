@@ -6,6 +6,7 @@ from turses.models import TimelineList
 from turses.session import (
     Session,
     clean_timeline_list_string,
+    parse_update_frequencies,
 )
 from turses.api.helpers import (
     is_home_timeline,
@@ -70,3 +71,20 @@ class SessionTest(unittest.TestCase):
         self.assertTrue(len(timeline_list), 4)
 
         self.assertTrue(is_messages_timeline(timeline_list[3]))
+
+    def test_parse_update_frequencies(self):
+        self.assertEqual(parse_update_frequencies(''), {})
+
+        self.assertEqual(
+            parse_update_frequencies('home=60, Search:turses = 600, foo'),
+            {'home': 60, 'search:turses': 600})
+
+    def test_update_frequency_overrides(self):
+        timeline_list = TimelineList()
+        self.session._update_frequencies_by_name = {'mentions': 60}
+
+        self.session.append_visible_timelines('home, mentions',
+                                              timeline_list)
+
+        self.assertEqual(self.session.update_frequencies,
+                         {timeline_list[1]: 60})
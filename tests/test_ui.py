@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from turses.ui import StatusWidget, map_attributes, parse_attributes
+from turses.config import configuration
+from turses.models import Timeline
+from turses.ui import (CursesInterface, RenderCache, StatusWidget,
+                       TimelineWalker, TimelineWidget, map_attributes,
+                       parse_attributes, render_cache)
 from tests import create_status, create_direct_message
 
 
@@ -112,7 +116,7 @@ class AttributeTest(unittest.TestCase):
                                 retweeted_status=original_status)
 
         # retweet text gets parsed because sometimes is not complete
-        expected_result = [u'I ', u'<3 ', ('hashtag', '#Python')]
+        expected_result = [u'I <3 ', ('hashtag', '#Python')]
         result = map_attributes(retweet,
                                 hashtag='hashtag',
                                 attag='attag',
@@ -145,6 +149,32 @@ class AttributeTest(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_map_attributes_url_format(self):
+        entities = {
+            'urls': [{'url': 'http://t.co/5lTGNzba',
+                      'indices': [6, 26],
+                      'expanded_url': 'https://github.com/louipc/turses',
+                      'display_url': 'github.com/louipc/turses'}],
+        }
+        status = create_status(text='Look: http://t.co/5lTGNzba',
+                               entities=entities)
+        url_format = configuration.styles['url_format']
+        self.addCleanup(configuration.styles.__setitem__, 'url_format',
+                        url_format)
+
+        expected_urls = {
+            'shortened': 'http://t.co/5lTGNzba',
+            'display': 'github.com/louipc/turses',
+            'original': 'https://github.com/louipc/turses',
+        }
+        for url_format, expected_url in expected_urls.items():
+            configuration.styles['url_format'] = url_format
+            result = map_attributes(status,
+                                    hashtag='hashtag',
+                                    attag='attag',
+                                    url='url')
+            self.assertEqual(result, ['Look: ', ('url', expected_url)])
+
     def test_parse_attributes(self):
         text = '@asdf http://www.dialelo.com #asf'
 
@@ -158,6 +188,24 @@ class AttributeTest(unittest.TestCase):
                                   url='url')
         self.assertEqual(result, expected_result)
 
+    def test_parse_attributes_preserves_whitespace(self):
+        text = 'Releasing\n\n#turses  by @dialelo\thttp://t.co/5lTGNzba #'
+
+        expected_result = ['Releasing\n\n', ('tag', '#turses'), '  by ',
+                           ('user', '@dialelo'), '\t',
+                           ('link', 'http://t.co/5lTGNzba'), ' #']
+
+        result = parse_attributes(text=text,
+                                  hashtag='tag',
+                                  attag='user',
+                                  url='link')
+        self.assertEqual(result, expected_result)
+
+    def test_parse_attributes_with_long_url_like_words(self):
+        text = ' '.join(['http://' + 'A' * 5000 + '\xe9'] * 10)
+
+        self.assertEqual(parse_attributes(text), [text])
+
 
 class StatusWidgetTest(unittest.TestCase):
     def test_create_with_status(self):
@@ -171,5 +219,173 @@ class StatusWidgetTest(unittest.TestCase):
         StatusWidget(direct_message)
 
 
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = RenderCache()
+        self.status = create_status(text='I love #Python')
+
+    def test_get_returns_header_and_text(self):
+        header, text = self.cache.get(self.status)
+
+        self.assertIn(self.status.user, header)
+        self.assertIn(('hashtag', '#Python'), text)
+
+    def test_text_is_processed_once(self):
+        _, text = self.cache.get(self.status)
+        _, same_text = self.cache.get(self.status)
+
+        self.assertIs(same_text, text)
+
+    def test_invalidate_status(self):
+        _, text = self.cache.get(self.status)
+
+        self.cache.invalidate(self.status)
+
+        self.assertIsNot(self.cache.get(self.status)[1], text)
+
+    def test_invalidate_bumps_generation(self):
+        _, text = self.cache.get(self.status)
+        generation = self.cache.generation
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.cache.generation, generation + 1)
+        self.assertIsNot(self.cache.get(self.status)[1], text)
+
+    def test_headers_are_rebuilt_when_their_time_changes(self):
+        now = [1010]
+        cache = RenderCache(clock=lambda: now[0])
+        status = create_status(created_at=1000)
+
+        header, _ = cache.get(status)
+        self.assertIn('10 seconds ago', header)
+
+        now[0] = 1010.5
+        cache.tick()
+        self.assertIs(cache.get(status)[0], header)
+
+        now[0] = 1011
+        self.assertIs(cache.get(status)[0], header)
+        cache.tick()
+        self.assertIn('11 seconds ago', cache.get(status)[0])
+
+
+class TimelineWalkerTest(unittest.TestCase):
+    def setUp(self):
+        self.timeline = Timeline(statuses=[create_status(id=id_num)
+                                           for id_num in range(1, 11)])
+        self.walker = TimelineWalker(self.timeline, cache_size=3)
+
+    def test_widgets_are_built_on_demand(self):
+        self.assertEqual(len(self.walker), 10)
+        self.assertEqual(len(self.walker._widgets), 0)
+
+        widget = self.walker[0]
+
+        self.assertEqual(widget.status.id, 10)
+        self.assertIs(self.walker[0], widget)
+        self.assertEqual(len(self.walker._widgets), 1)
+
+    def test_least_recently_used_widgets_are_discarded(self):
+        first = self.walker[0]
+        for position in range(1, 4):
+            self.walker[position]
+
+        self.assertEqual(len(self.walker._widgets), 3)
+        self.assertIsNot(self.walker[0], first)
+
+    def test_refresh_headers(self):
+        widget = self.walker[0]
+        self.addCleanup(render_cache.tick)
+
+        self.assertFalse(self.walker.refresh_headers())
+
+        render_cache.now = widget.status.created_at + 150
+        self.assertTrue(self.walker.refresh_headers())
+        self.assertIn('2 minutes ago', widget.header_text)
+
+    def test_positions_out_of_bounds(self):
+        self.assertRaises(IndexError, self.walker.__getitem__, -1)
+        self.assertRaises(IndexError, self.walker.__getitem__, 10)
+        self.assertRaises(IndexError, self.walker.prev_position, 0)
+
+    def test_render_only_builds_visible_widgets(self):
+        timeline = Timeline(statuses=[create_status(id=id_num)
+                                      for id_num in range(1, 1001)])
+        timeline_widget = TimelineWidget(timeline)
+
+        timeline_widget.render((80, 24), focus=True)
+
+        self.assertLessEqual(len(timeline_widget.body._widgets), 24)
+
+
+class CursesInterfaceTest(unittest.TestCase):
+    def setUp(self):
+        self.ui = CursesInterface()
+        self.timeline = Timeline(statuses=[create_status(id=1)])
+
+    def status_widgets(self):
+        timeline_widget = self.ui.frame.body.timeline_widgets[0]
+        return list(timeline_widget.body)
+
+    def test_draw_timelines_reuses_widgets(self):
+        self.ui.draw_timelines([self.timeline])
+        timelines_buffer = self.ui.frame.body
+        status_widgets = self.status_widgets()
+
+        self.ui.draw_timelines([self.timeline])
+
+        self.assertIs(self.ui.frame.body, timelines_buffer)
+        self.assertEqual(self.status_widgets(), status_widgets)
+
+    def test_draw_timelines_only_creates_widgets_for_new_statuses(self):
+        self.ui.draw_timelines([self.timeline])
+        old_widget, = self.status_widgets()
+
+        self.timeline.add_status(create_status(id=2))
+        self.ui.draw_timelines([self.timeline])
+
+        new_widget, same_widget = self.status_widgets()
+        self.assertIs(same_widget, old_widget)
+        self.assertEqual(new_widget.status.id, 2)
+
+    def test_draw_timelines_refreshes_headers_of_reused_widgets(self):
+        clock = render_cache.clock
+        self.addCleanup(setattr, render_cache, 'clock', clock)
+        created_at = self.timeline[0].created_at
+        render_cache.clock = lambda: created_at + 10
+        self.ui.draw_timelines([self.timeline])
+        widget, = self.status_widgets()
+        self.assertIn('10 seconds ago', widget.header_text)
+
+        render_cache.clock = lambda: created_at + 150
+        self.ui.draw_timelines([self.timeline])
+
+        self.assertIs(self.status_widgets()[0], widget)
+        self.assertIn('2 minutes ago', widget.header_text)
+
+    def test_draw_timelines_shows_statuses_added_to_an_empty_timeline(self):
+        timeline = Timeline()
+        self.ui.draw_timelines([timeline])
+
+        timeline.add_statuses([create_status(id=id_num)
+                               for id_num in (1, 2, 3)])
+        self.ui.draw_timelines([timeline])
+
+        self.assertEqual([widget.status.id
+                          for widget in self.status_widgets()],
+                         [3, 2, 1])
+
+    def test_invalidate_timelines(self):
+        self.ui.draw_timelines([self.timeline])
+        old_widget, = self.status_widgets()
+
+        self.ui.invalidate_timelines()
+        self.ui.draw_timelines([self.timeline])
+
+        new_widget, = self.status_widgets()
+        self.assertIsNot(new_widget, old_widget)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,7 +5,10 @@ This module contains implementations of :class:`turses.api.base.ApiAdapter`
 using libraries for accessing the Twitter API.
 """
 
+import re
 from functools import wraps, partial
+from html import unescape
+from urllib.parse import urlparse
 
 from tweepy import API as BaseTweepyApi
 from tweepy import OAuthHandler as TweepyOAuthHandler
@@ -26,6 +29,23 @@ def include_entities(func):
         return func(*args, **kwargs)
     return wrapper
 
+
+# HTML entities in the text of tweets
+html_entity_regex = re.compile(r'&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z0-9]+);')
+
+
+def _unescape(text):
+    """
+    Unescape the HTML entities of `text`.
+
+    Twitter computes the indices of the entities of a tweet on its unescaped
+    text, so they are valid for the text returned.
+    """
+    if not text or '&' not in text:
+        return text
+    return html_entity_regex.sub(lambda match: unescape(match.group()), text)
+
+
 # Decorators for converting data to `turses.models`
 
 
@@ -37,6 +57,7 @@ def _to_status(status, **kwargs):
         text = status.full_text
     else:
         text = status.text
+    text = _unescape(text)
     defaults = {
         'id': status.id,
         'created_at': status.created_at,
@@ -86,12 +107,13 @@ def _to_direct_message(dm, **kwargs):
     """
     Convert a `tweepy.DirectMessage` to a `turses.models.DirectMessage`.
     """
+    text = _unescape(dm.text)
     defaults = {
         'id': dm.id,
         'created_at': dm.created_at,
         'sender_screen_name': dm.sender_screen_name,
         'recipient_screen_name': dm.recipient_screen_name,
-        'text': dm.text,
+        'text': text,
         'entities': getattr(dm, 'entities', None),
     }
 
@@ -108,7 +130,7 @@ def _to_user(user, **kwargs):
         'id': user.id,
         'name': user.name,
         'screen_name': user.screen_name,
-        'description': user.description,
+        'description': _unescape(user.description),
         'url': user.url,
         'created_at': user.created_at,
         'friends_count': user.friends_count,
@@ -164,6 +186,7 @@ class TweepyApi(BaseTweepyApi, ApiAdapter):
 
     def __init__(self, *args, **kwargs):
         ApiAdapter.__init__(self, *args, **kwargs)
+        self._user = None
 
     # from `turses.api.base.ApiAdapter`
 
@@ -178,11 +201,38 @@ class TweepyApi(BaseTweepyApi, ApiAdapter):
                                        self._access_token_secret)
 
         self._api = BaseTweepyApi(oauth_handler)
+        self._user = None
 
-    @to_user
     def verify_credentials(self):
+        if self._user is None:
+            self._user = self._verify_credentials()
+        return self._user
+
+    @to_user
+    def _verify_credentials(self):
         return self._api.me()
 
+    def invalidate_user(self):
+        self._user = None
+
+    def rate_limit(self):
+        response = getattr(self._api, 'last_response', None)
+        if response is None:
+            return None
+
+        headers = response.headers
+        try:
+            limit = int(headers['x-rate-limit-limit'])
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset = int(headers['x-rate-limit-reset'])
+        except (KeyError, ValueError):
+            return None
+
+        # e.g. '/1.1/statuses/home_timeline.json' -> 'statuses/home_timeline'
+        path = urlparse(response.url).path
+        endpoint = path.split('/', 2)[-1].rsplit('.', 1)[0]
+        return endpoint, limit, remaining, reset
+
     @to_user
     @include_entities
     def get_user(self, screen_name, **kwargs):
@@ -346,9 +396,10 @@ class TweepyApi(BaseTweepyApi, ApiAdapter):
         return self._api.lists_subscriptions()
 
     @to_status
-    def get_list_timeline(self, a_list):
+    def get_list_timeline(self, a_list, **kwargs):
         owner = a_list.owner.screen_name
-        return self._api.list_timeline(owner=owner, slug=a_list.slug, tweet_mode="extended")
+        return self._api.list_timeline(owner=owner, slug=a_list.slug,
+                                       tweet_mode="extended", **kwargs)
 
     @to_user
     def get_list_members(self, a_list):
@@ -10,12 +10,14 @@ tokens.
 """
 from abc import ABCMeta, abstractmethod
 from gettext import gettext as _
+from threading import Event
 
 import tweepy
 
 from turses.models import is_DM
 from turses.utils import encode
 from turses.meta import async_thread, wrap_exceptions
+from turses.api.ratelimit import RateLimiter
 
 
 TWITTER_CONSUMER_KEY = 'OEn4hrNGknVz9ozQytoR0A'
@@ -85,7 +87,25 @@ class ApiAdapter(metaclass=ABCMeta):
         self._consumer_secret = consumer_secret
         self._access_token_key = access_token_key
         self._access_token_secret = access_token_secret
-        self.is_authenticated = False
+        self._authenticated = Event()
+
+    @property
+    def is_authenticated(self):
+        return self._authenticated.is_set()
+
+    @is_authenticated.setter
+    def is_authenticated(self, authenticated):
+        if authenticated:
+            self._authenticated.set()
+        else:
+            self._authenticated.clear()
+
+    def wait_until_authenticated(self, timeout=None):
+        """
+        Block until the API is authenticated or `timeout` seconds pass.
+        Return `True` if the API is authenticated.
+        """
+        return self._authenticated.wait(timeout)
 
     @abstractmethod
     def init_api(self):
@@ -99,6 +119,20 @@ class ApiAdapter(metaclass=ABCMeta):
         """
         pass
 
+    def invalidate_user(self):
+        """
+        Forget the authenticating user, so the next call to
+        :meth:`verify_credentials` fetches it again.
+        """
+        pass
+
+    def rate_limit(self):
+        """
+        Return the rate limit reported in the last response as an
+        ``(endpoint, limit, remaining, reset)`` tuple, or `None` if unknown.
+        """
+        return None
+
     # users
 
     @abstractmethod
@@ -254,51 +288,95 @@ class AsyncApi(ApiAdapter):
         ApiAdapter.__init__(self, *args, **kwargs)
         self._api = api_cls(access_token_key=self._access_token_key,
                             access_token_secret=self._access_token_secret,)
+        self.rate_limiter = RateLimiter(rate_limit=self._api.rate_limit)
+        self.user = None
 
     @wrap_exceptions
     def init_api(self):
         self._api.init_api()
+        self.invalidate_user()
         self.is_authenticated = True
         self.user = self.verify_credentials()
 
     def verify_credentials(self):
-        return self._api.verify_credentials()
+        """
+        Return the authenticating user, which is only fetched the first time
+        or after :meth:`invalidate_user` is called.
+        """
+        user = self.user
+        if user is None:
+            user = self.rate_limiter.call('account/verify_credentials',
+                                          self._api.verify_credentials)
+            self.user = user
+        return user
+
+    def invalidate_user(self):
+        self.user = None
+        self._api.invalidate_user()
 
     def get_status(self, **kwargs):
-        return self._api.get_status(**kwargs)
+        return self.rate_limiter.call('statuses/show',
+                                      self._api.get_status,
+                                      **kwargs)
 
     def get_home_timeline(self, **kwargs):
-        return self._api.get_home_timeline(**kwargs)
+        return self.rate_limiter.call('statuses/home_timeline',
+                                      self._api.get_home_timeline,
+                                      **kwargs)
 
     def get_user_timeline(self, screen_name, **kwargs):
-        return self._api.get_user_timeline(screen_name=screen_name, **kwargs)
+        return self.rate_limiter.call('statuses/user_timeline',
+                                      self._api.get_user_timeline,
+                                      screen_name=screen_name,
+                                      **kwargs)
 
     def get_own_timeline(self, **kwargs):
-        return self._api.get_own_timeline(**kwargs)
+        return self.rate_limiter.call('statuses/user_timeline',
+                                      self._api.get_own_timeline,
+                                      **kwargs)
 
     def get_mentions(self, **kwargs):
-        return self._api.get_mentions()
+        return self.rate_limiter.call('statuses/mentions_timeline',
+                                      self._api.get_mentions,
+                                      **kwargs)
 
     def get_favorites(self, **kwargs):
-        return self._api.get_favorites()
+        return self.rate_limiter.call('favorites/list',
+                                      self._api.get_favorites,
+                                      **kwargs)
 
     def get_direct_messages(self, **kwargs):
-        return self._api.get_direct_messages(**kwargs)
+        return self.rate_limiter.call('direct_messages',
+                                      self._api.get_direct_messages,
+                                      **kwargs)
 
     def get_thread(self, status, **kwargs):
-        return self._api.get_thread(status, **kwargs)
+        return self.rate_limiter.call('statuses/user_timeline',
+                                      self._api.get_thread,
+                                      status,
+                                      **kwargs)
 
     def get_message_thread(self, dm, **kwargs):
-        return self._api.get_message_thread(dm, **kwargs)
+        return self.rate_limiter.call('direct_messages',
+                                      self._api.get_message_thread,
+                                      dm,
+                                      **kwargs)
 
     def search(self, text, **kwargs):
-        return self._api.search(text, **kwargs)
+        return self.rate_limiter.call('search/tweets',
+                                      self._api.search,
+                                      text,
+                                      **kwargs)
 
     def get_retweets_of_me(self, **kwargs):
-        return self._api.get_retweets_of_me(**kwargs)
+        return self.rate_limiter.call('statuses/retweets_of_me',
+                                      self._api.get_retweets_of_me,
+                                      **kwargs)
 
     def get_user(self, screen_name):
-        return self._api.get_user(screen_name)
+        return self.rate_limiter.call('users/show',
+                                      self._api.get_user,
+                                      screen_name)
 
     @async_thread
     @wrap_exceptions
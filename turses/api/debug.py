@@ -97,35 +97,35 @@ class MockApi(ApiAdapter):
     def get_status(self, status_id):
         return random_status(id=status_id)
 
-    def get_home_timeline(self):
+    def get_home_timeline(self, **kwargs):
         return random_status(quantity=3)
 
-    def get_user_timeline(self, screen_name):
+    def get_user_timeline(self, screen_name, **kwargs):
         return random_status(quantity=10)
 
-    def get_own_timeline(self):
+    def get_own_timeline(self, **kwargs):
         return random_status(quantity=10)
 
-    def get_mentions(self):
+    def get_mentions(self, **kwargs):
         return random_status(quantity=10)
 
-    def get_favorites(self):
+    def get_favorites(self, **kwargs):
         return random_status(quantity=10)
 
-    def get_direct_messages(self):
+    def get_direct_messages(self, **kwargs):
         # TODO: random DM
         return random_status(quantity=10)
 
-    def get_thread(self, status):
+    def get_thread(self, status, **kwargs):
         return random_status(quantity=14)
 
-    def get_message_thread(self, status):
+    def get_message_thread(self, status, **kwargs):
         return random_status(quantity=4)
 
-    def search(self, text):
+    def search(self, text, **kwargs):
         return random_status(quantity=14)
 
-    def get_retweets_of_me(self):
+    def get_retweets_of_me(self, **kwargs):
         return random_status(quantity=14)
 
     # statuses
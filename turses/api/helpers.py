@@ -7,6 +7,7 @@ import re
 from functools import partial
 from gettext import gettext as _
 
+from turses.config import configuration
 from turses.models import Timeline, is_DM
 
 
@@ -24,6 +25,46 @@ DEFAULT_TIMELINES = [
     OWN_TWEETS_TIMELINE,
 ]
 
+# statuses per page returned by the update functions that fetch a single
+# page of a timeline, the direct messages merge the received and sent pages
+PAGE_SIZES = {
+    'get_home_timeline': 20,
+    'get_user_timeline': 20,
+    'get_own_timeline': 20,
+    'get_mentions': 20,
+    'get_favorites': 20,
+    'get_retweets_of_me': 20,
+    'search': 15,
+}
+
+# update functions that ignore the paging parameters
+UNPAGED_FUNCTIONS = [
+    'get_thread',
+]
+
+# update functions whose statuses are added to the timeline when they are
+# favorited or retweeted, but are paged by the id of the original tweet
+UNSORTED_FUNCTIONS = [
+    'get_favorites',
+    'get_retweets_of_me',
+]
+
+
+def create_timeline(**kwargs):
+    """
+    Create a :class:`~turses.models.Timeline` bounded by the configured
+    `timeline_capacity`, with the paging of its update function.
+    """
+    update_function_name = getattr(kwargs.get('update_function'),
+                                   '__name__',
+                                   None)
+    kwargs.setdefault('capacity', configuration.twitter['timeline_capacity'])
+    kwargs.setdefault('page_size', PAGE_SIZES.get(update_function_name))
+    kwargs.setdefault('paged', update_function_name not in UNPAGED_FUNCTIONS)
+    kwargs.setdefault('sorted_by_id',
+                      update_function_name not in UNSORTED_FUNCTIONS)
+    return Timeline(**kwargs)
+
 
 def check_update_function_name(timeline, update_function_name=None):
     if not isinstance(timeline, Timeline):
@@ -69,45 +110,47 @@ class TimelineFactory:
         timeline = timeline_string.strip()
 
         if timeline == HOME_TIMELINE:
-            return Timeline(name=_('tweets'),
-                            update_function=self.api.get_home_timeline,)
+            return create_timeline(name=_('tweets'),
+                                   update_function=self.api.get_home_timeline,)
         elif timeline == MENTIONS_TIMELINE:
-            return Timeline(name=_('mentions'),
-                            update_function=self.api.get_mentions,)
+            return create_timeline(name=_('mentions'),
+                                   update_function=self.api.get_mentions,)
         elif timeline == FAVORITES_TIMELINE:
-            return Timeline(name=_('favorites'),
-                            update_function=self.api.get_favorites,)
+            return create_timeline(name=_('favorites'),
+                                   update_function=self.api.get_favorites,)
         elif timeline == MESSAGES_TIMELINE:
-            return Timeline(name=_('messages'),
-                            update_function=self.api.get_direct_messages,)
+            return create_timeline(
+                name=_('messages'),
+                update_function=self.api.get_direct_messages,)
         elif timeline == OWN_TWEETS_TIMELINE:
-            return Timeline(name=_('me'),
-                            update_function=self.api.get_own_timeline,)
+            return create_timeline(name=_('me'),
+                                   update_function=self.api.get_own_timeline,)
         elif timeline == 'retweets_of_me':
-            return Timeline(name=_('retweets of me'),
-                            update_function=self.api.get_retweets_of_me,)
+            return create_timeline(
+                name=_('retweets of me'),
+                update_function=self.api.get_retweets_of_me,)
 
         is_search = search_name_re.match(timeline)
         if is_search:
             query = is_search.groupdict()['query']
-            return Timeline(name=_('Search: %s' % query),
-                            update_function=self.api.search,
-                            update_function_args=query,)
+            return create_timeline(name=_('Search: %s' % query),
+                                   update_function=self.api.search,
+                                   update_function_args=query,)
 
         is_hashtag = hashtag_name_re.match(timeline)
         if is_hashtag:
             query = "#{}".format(is_hashtag.groupdict()['query'])
-            return Timeline(name=_('hashtag: %s' % query),
-                            update_function=self.api.search,
-                            update_function_args=query,)
+            return create_timeline(name=_('hashtag: %s' % query),
+                                   update_function=self.api.search,
+                                   update_function_args=query,)
 
         is_user = user_name_re.match(timeline)
         if is_user:
             screen_name = is_user.groupdict()['screen_name']
             timeline_name = _('@{screen_name}'.format(screen_name=screen_name))
-            return Timeline(name=timeline_name,
-                            update_function=self.api.get_user_timeline,
-                            update_function_args=screen_name,)
+            return create_timeline(name=timeline_name,
+                                   update_function=self.api.get_user_timeline,
+                                   update_function_args=screen_name,)
 
     def valid_timeline_name(self, name):
         if name in DEFAULT_TIMELINES:
@@ -145,6 +188,6 @@ class TimelineFactory:
             name = _('thread: %s' % ', '.join(participants))
             update_function = self.api.get_thread
 
-        return Timeline(name=name,
-                        update_function=update_function,
-                        update_function_args=status,)
+        return create_timeline(name=name,
+                               update_function=update_function,
+                               update_function_args=status,)
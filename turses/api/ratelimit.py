@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a scheduler for the requests made to the Twitter API
+that keeps them within the rate limits of each endpoint.
+
+Twitter reports the quota of an endpoint in the headers of its responses;
+the :class:`RateLimiter` records it and refuses the requests that would go
+over the quota of their endpoint with a :class:`RateLimited` error, which
+tells when they can be retried. Requests made on behalf of the user (e.g.
+opening a timeline) take priority over the ones performed in the background
+(e.g. periodic updates).
+
+Requests never wait for their quota: the threads that perform them are
+shared with the rest of the application, so the callers are responsible for
+retrying them later.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from time import localtime, strftime, time
+
+
+# requests of an endpoint reserved for interactive use
+INTERACTIVE_RESERVE = 1
+
+_local = threading.local()
+
+
+@contextmanager
+def background_requests():
+    """
+    Context manager for marking the requests performed by the current thread
+    as background requests.
+    """
+    previous = getattr(_local, 'background', False)
+    _local.background = True
+    try:
+        yield
+    finally:
+        _local.background = previous
+
+
+@contextmanager
+def interactive_requests():
+    """
+    Context manager for the requests performed by the current thread on
+    behalf of the user, which is the default.
+    """
+    yield
+
+
+def is_background_request():
+    return getattr(_local, 'background', False)
+
+
+class RateLimited(Exception):
+    """
+    A request to `endpoint` can't be made until `retry_at` (in seconds since
+    the epoch) without going over its rate limit.
+    """
+
+    def __init__(self, endpoint, retry_at):
+        Exception.__init__(self, endpoint, retry_at)
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+
+    def __str__(self):
+        return 'rate limit of %s exceeded until %s' % (
+            self.endpoint, strftime('%H:%M:%S', localtime(self.retry_at)))
+
+
+class Quota(object):
+    """The rate limit of an endpoint in the current window."""
+
+    __slots__ = ('limit', 'remaining', 'reset')
+
+    def __init__(self, limit, remaining, reset):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+
+    def __repr__(self):
+        return 'Quota(limit=%r, remaining=%r, reset=%r)' % (self.limit,
+                                                            self.remaining,
+                                                            self.reset)
+
+
+class RateLimiter(object):
+    """
+    Keep track of the remaining quota of each endpoint and tell the callers
+    of :meth:`acquire` whether they can make a request.
+
+    Interactive requests are made while there is quota left. Background
+    requests are spaced out evenly across what remains of the window and
+    leave :data:`INTERACTIVE_RESERVE` requests for interactive use.
+    """
+
+    def __init__(self, rate_limit=None, clock=time):
+        """
+        `rate_limit` is a function that returns the quota reported in the last
+        response received as an ``(endpoint, limit, remaining, reset)`` tuple,
+        or ``None``.
+        """
+        self.rate_limit = rate_limit
+        self.clock = clock
+        self._quotas = {}
+        self._last_request = {}
+        self._lock = threading.Lock()
+
+    def quotas(self):
+        """Return a dictionary with a copy of the quota of each endpoint."""
+        with self._lock:
+            return dict((endpoint, Quota(q.limit, q.remaining, q.reset))
+                        for endpoint, q in self._quotas.items())
+
+    def _wait_time(self, endpoint, background):
+        now = self.clock()
+        quota = self._quotas.get(endpoint)
+        if quota is None or quota.reset <= now:
+            # unknown quota or new window
+            return 0
+
+        window_left = quota.reset - now
+        if background:
+            available = quota.remaining - INTERACTIVE_RESERVE
+            if available <= 0:
+                return window_left
+            spacing = window_left / available
+            last_request = self._last_request.get(endpoint, 0)
+            return last_request + spacing - now
+        elif quota.remaining <= 0:
+            return window_left
+        return 0
+
+    def acquire(self, endpoint):
+        """
+        Count a request to `endpoint` made by the current thread, raising
+        :class:`RateLimited` if it can't be made yet.
+        """
+        background = is_background_request()
+        with self._lock:
+            wait = self._wait_time(endpoint, background)
+            if wait > 0:
+                logging.debug('%s rate limited for %.1fs', endpoint, wait)
+                raise RateLimited(endpoint, self.clock() + wait)
+
+            quota = self._quotas.get(endpoint)
+            if quota is not None and quota.remaining > 0:
+                quota.remaining -= 1
+            self._last_request[endpoint] = self.clock()
+
+    def update(self, endpoint, limit, remaining, reset):
+        """Record the quota of `endpoint` reported by Twitter."""
+        with self._lock:
+            self._quotas[endpoint] = Quota(limit, remaining, reset)
+
+    def call(self, endpoint, func, *args, **kwargs):
+        """
+        Call `func` with the given arguments if a request to `endpoint` can
+        be made, recording the quota reported in the response. Raise
+        :class:`RateLimited` otherwise.
+        """
+        self.acquire(endpoint)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            reported = self.rate_limit() if callable(self.rate_limit) else None
+            if reported is not None:
+                self.update(*reported)
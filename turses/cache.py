@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+The statuses of the session timelines are cached on disk periodically and
+when exiting ``turses``, so the next time it is launched they are shown right
+away and only the statuses newer than the cached ones are fetched.
+
+Each account has its own cache, an SQLite database located on
+``$HOME/.turses/cache`` (or ``$HOME/.turses/<account>.cache`` for the accounts
+loaded with ``-a``), in which every session keeps the newest ``cache_size``
+statuses of each of its timelines.
+
+The statuses are stored as JSON objects with the fields listed in
+:data:`STATUS_FIELDS` and :data:`DIRECT_MESSAGE_FIELDS`. The database records
+the :data:`SCHEMA_VERSION` they were stored with, and the cache is discarded
+when it doesn't match the current one.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import closing
+
+from turses.models import DirectMessage, Status
+
+
+# version of the format of the cached statuses, it must be increased whenever
+# the format changes
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statuses (
+    session TEXT NOT NULL,
+    timeline TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (session, timeline, id)
+)
+"""
+
+# fields of the statuses passed to their constructor
+STATUS_FIELDS = (
+    'id',
+    'created_at',
+    'user',
+    'text',
+    'author',
+    'is_reply',
+    'is_retweet',
+    'is_favorite',
+    'retweet_count',
+)
+DIRECT_MESSAGE_FIELDS = (
+    'id',
+    'created_at',
+    'sender_screen_name',
+    'recipient_screen_name',
+    'text',
+)
+
+
+def status_to_dict(status):
+    """Return a dictionary with the fields of `status` that are cached."""
+    if isinstance(status, DirectMessage):
+        data = dict((field, getattr(status, field))
+                    for field in DIRECT_MESSAGE_FIELDS)
+        data['direct_message'] = True
+    else:
+        data = dict((field, getattr(status, field))
+                    for field in STATUS_FIELDS)
+        if status.retweeted_status is not None:
+            data['retweeted_status'] = status_to_dict(status.retweeted_status)
+    data['spans'] = status.spans
+    data['read'] = status.read
+    return data
+
+
+def status_from_dict(data):
+    """Return the status stored in the `data` dictionary."""
+    if data.get('direct_message'):
+        status = DirectMessage(**dict((field, data[field])
+                                      for field in DIRECT_MESSAGE_FIELDS))
+    else:
+        retweeted_status = data.get('retweeted_status')
+        if retweeted_status is not None:
+            retweeted_status = status_from_dict(retweeted_status)
+        status = Status(retweeted_status=retweeted_status,
+                        **dict((field, data[field])
+                               for field in STATUS_FIELDS))
+    spans = data['spans']
+    if spans:
+        status.spans = tuple((kind,
+                              start,
+                              end,
+                              tuple(replacement) if replacement else None)
+                             for kind, start, end, replacement in spans)
+    status.read = data['read']
+    return status
+
+
+class StatusCache:
+    """
+    Stores the statuses of the timelines of a `session` in the database
+    located on `filename`, up to `size` statuses per timeline. A `size` of
+    ``0`` disables the cache.
+
+    The timelines are identified by the name used for declaring them in the
+    session. The statuses are stored with their read flag, and the newest of
+    them acts as the cursor for fetching the statuses posted afterwards.
+    """
+
+    def __init__(self, filename, session, size):
+        self.filename = filename
+        self.session = session
+        self.size = size
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.filename)
+        version, = connection.execute('PRAGMA user_version').fetchone()
+        if version != SCHEMA_VERSION:
+            logging.info('discarding the cache of version %d', version)
+            with connection:
+                connection.execute('DROP TABLE IF EXISTS statuses')
+                connection.execute(SCHEMA)
+                connection.execute('PRAGMA user_version = %d' %
+                                   SCHEMA_VERSION)
+        return connection
+
+    def load(self):
+        """
+        Return a dictionary that maps the name of each cached timeline to its
+        statuses, newest first.
+        """
+        if not self.size:
+            return {}
+
+        try:
+            with self._lock, closing(self._connect()) as connection:
+                rows = connection.execute(
+                    'SELECT timeline, status FROM statuses '
+                    'WHERE session = ? ORDER BY id DESC',
+                    (self.session,)).fetchall()
+        except sqlite3.Error as message:
+            logging.exception(message)
+            return {}
+
+        cached = {}
+        for timeline_name, status in rows:
+            statuses = cached.setdefault(timeline_name, [])
+            if len(statuses) >= self.size:
+                continue
+            try:
+                statuses.append(status_from_dict(json.loads(status)))
+            except (ValueError, KeyError, TypeError) as message:
+                logging.error('Invalid cached status: %s', message)
+        return cached
+
+    def save(self, statuses_by_timeline):
+        """
+        Replace the cached timelines of the session with the newest statuses
+        of the ones in `statuses_by_timeline`, a dictionary that maps the name
+        of each timeline to its statuses.
+        """
+        if not self.size:
+            return
+
+        rows = []
+        for timeline_name, statuses in statuses_by_timeline.items():
+            newest = sorted(statuses, key=lambda status: status.id,
+                            reverse=True)
+            rows.extend((self.session, timeline_name, status.id,
+                         json.dumps(status_to_dict(status)))
+                        for status in newest[:self.size])
+
+        try:
+            with self._lock, closing(self._connect()) as connection:
+                with connection:
+                    connection.execute(
+                        'DELETE FROM statuses WHERE session = ?',
+                        (self.session,))
+                    connection.executemany(
+                        'INSERT OR REPLACE INTO statuses VALUES (?, ?, ?, ?)',
+                        rows)
+        except sqlite3.Error as message:
+            logging.exception(message)
@@ -14,7 +14,7 @@ An one default token file:
         contains authentication token for the default user account
 
 Each user account that is no the default one needs to be aliased and  has its
-own token file ``alias.token``.
+own token file ``alias.token`` and cache of statuses ``alias.cache``.
 
 To create an aliased account:
 
@@ -44,8 +44,11 @@ to ``alice`` and ``bob``.
     | |-config
     | |-alice.config
     | |-token
+    | |-cache
     | |-alice.token
-    | `-bob.token
+    | |-alice.cache
+    | |-bob.token
+    | `-bob.cache
     |+...
     |-...
     `
@@ -182,6 +185,8 @@ KEY_BINDINGS = {
         ('?', _('show program help')),
     'reload_config':
         ('C', _('reload configuration')),
+    'rate_limits':
+        ('ctrl r', _('show the remaining requests to the Twitter API')),
 
     # turses
     'quit':
@@ -262,6 +267,7 @@ TIMELINES_KEY_BINDINGS = [
 META_KEY_BINDINGS = [
     'help',
     'reload_config',
+    'rate_limits',
 ]
 
 TURSES_KEY_BINDINGS = [
@@ -350,6 +356,7 @@ STYLES = {
     'editor_vertical_align': 'bottom',
     'url_format': 'display',
     'statuses_in_user_info': 3,
+    'max_frame_rate': 20,
 }
 
 # Debug
@@ -359,10 +366,14 @@ LOGGING_LEVEL = 3
 # Twitter
 UPDATE_FREQUENCY = 300
 USE_HTTPS = True
+TIMELINE_CAPACITY = 1000
+CACHE_SIZE = 200
 
 TWITTER = {
     'update_frequency': UPDATE_FREQUENCY,
     'use_https': USE_HTTPS,
+    'timeline_capacity': TIMELINE_CAPACITY,
+    'cache_size': CACHE_SIZE,
 }
 
 # Environment
@@ -378,6 +389,7 @@ CONFIG_DIR = '.turses'
 CONFIG_PATH = path.join(HOME, CONFIG_DIR)
 DEFAULT_CONFIG_FILE = path.join(CONFIG_PATH, 'config')
 DEFAULT_TOKEN_FILE = path.join(CONFIG_PATH, 'token')
+DEFAULT_CACHE_FILE = path.join(CONFIG_PATH, 'cache')
 LOG_FILE = path.join(CONFIG_PATH, 'log')
 
 LEGACY_CONFIG_DIR = '.config/turses'
@@ -451,6 +463,7 @@ class Configuration:
         # config and token files
         self.config_file = DEFAULT_CONFIG_FILE
         self.token_file = DEFAULT_TOKEN_FILE
+        self.cache_file = DEFAULT_CACHE_FILE
 
         # debug mode
         self.debug = False
@@ -480,10 +493,12 @@ class Configuration:
             self.config_file = path.join(CONFIG_PATH, '%s.config' % (
                 cli_args.account))
 
-        # path to token file
+        # path to token and cache files
         if cli_args.account:
             self.token_file = path.join(CONFIG_PATH, '%s.token' % (
                 cli_args.account))
+            self.cache_file = path.join(CONFIG_PATH, '%s.cache' % (
+                cli_args.account))
 
         # session
         if cli_args.session:
@@ -518,6 +533,10 @@ class Configuration:
             conf.set(SECTION_TWITTER, 'update_frequency', UPDATE_FREQUENCY)
         if not conf.has_option(SECTION_TWITTER, 'use_https'):
             conf.set(SECTION_TWITTER, 'use_https', USE_HTTPS)
+        if not conf.has_option(SECTION_TWITTER, 'timeline_capacity'):
+            conf.set(SECTION_TWITTER, 'timeline_capacity', TIMELINE_CAPACITY)
+        if not conf.has_option(SECTION_TWITTER, 'cache_size'):
+            conf.set(SECTION_TWITTER, 'cache_size', CACHE_SIZE)
 
     def _add_section_key_bindings(self, conf):
         # Key bindings
@@ -718,6 +737,12 @@ class Configuration:
         if conf.has_option(SECTION_TWITTER, 'use_https'):
             self.twitter['use_https'] = conf.getboolean(SECTION_TWITTER,
                                                         'use_https')
+        if conf.has_option(SECTION_TWITTER, 'timeline_capacity'):
+            self.twitter['timeline_capacity'] = conf.getint(
+                SECTION_TWITTER, 'timeline_capacity')
+        if conf.has_option(SECTION_TWITTER, 'cache_size'):
+            self.twitter['cache_size'] = conf.getint(SECTION_TWITTER,
+                                                     'cache_size')
 
     def _parse_key_bindings(self, conf):
         for binding in self.key_bindings:
@@ -748,7 +773,7 @@ class Configuration:
                 elif (style == 'url_format' and
                       style in ['shortened', 'original', 'display']):
                     self.styles[style] = conf.get(SECTION_STYLES, style)
-                elif style == 'statuses_in_user_info':
+                elif style in ['statuses_in_user_info', 'max_frame_rate']:
                     self.styles[style] = conf.getint(SECTION_STYLES, style)
                 else:
                     self.styles[style] = conf.get(SECTION_STYLES, style)
@@ -3,30 +3,55 @@
 """
 This module contains the controller and key handling logic of turses.
 """
+import os
 import signal
 import logging
+import threading
+from time import localtime, strftime, time
 from gettext import gettext as _
 from functools import partial, wraps
+from queue import Queue, Empty
 import webbrowser
 
 import urwid
 from tweepy import TweepError
 
 from turses.utils import get_urls
-from turses.meta import async_thread, wrap_exceptions, Observer
+from turses.meta import (async_thread, wrap_exceptions, worker_pool, Cursor,
+                         Observer)
 from turses.config import configuration
-from turses.utils import is_username
+from turses.utils import is_username, sanitize_username
 from turses.models import (
     is_DM,
     is_valid_status_text,
     is_valid_search_text,
-    sanitize_username,
-
-    Timeline,
 )
+from turses.api.helpers import create_timeline
+from turses.api.ratelimit import (RateLimited, background_requests,
+                                  interactive_requests)
+from turses.cache import StatusCache
 from turses.session import Session
 
 
+# statuses returned by Twitter in a timeline page
+PAGE_SIZE = 20
+
+# maximum number of pages requested for filling a gap in a timeline
+MAX_BACKFILL_PAGES = 5
+
+# how many times the update frequency a quiet timeline can back off to
+MAX_BACKOFF = 8
+
+# how many times less often background timelines are updated
+BACKGROUND_FACTOR = 2
+
+# seconds between the refreshes of the relative times of the statuses shown
+CLOCK_TICK = 1
+
+# seconds between the saves of the statuses in the cache
+CACHE_SAVE_INTERVAL = 5 * 60
+
+
 def merge_dicts(*args):
     """
     Merge all dictionaries given as positional arguments in a single
@@ -38,6 +63,187 @@ def merge_dicts(*args):
     return result
 
 
+class MainLoopDispatcher(object):
+    """
+    Hand off calls from worker threads to the thread of the urwid main loop.
+
+    Calls are queued with :meth:`call` and the main loop is woken up through
+    a watched pipe, executing them in order. Until a main loop is attached the
+    calls are executed right away.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._queue = Queue()
+        self._pipe = None
+        self._thread = None
+
+    def attach(self, loop):
+        """Execute the calls in the thread of the main `loop`."""
+        self.loop = loop
+        self._pipe = loop.watch_pipe(self._wake_up)
+        self._thread = threading.current_thread()
+
+    def in_loop_thread(self):
+        """
+        Return ``True`` if called from the thread of the main loop or if
+        there is no main loop attached.
+        """
+        return self.loop is None or self._thread is threading.current_thread()
+
+    def call(self, func, *args, **kwargs):
+        """Execute `func` with the given arguments in the main loop."""
+        if self.loop is None:
+            func(*args, **kwargs)
+        else:
+            self._queue.put((func, args, kwargs))
+            os.write(self._pipe, b'c')
+
+    def _wake_up(self, data):
+        while True:
+            try:
+                func, args, kwargs = self._queue.get_nowait()
+            except Empty:
+                break
+            try:
+                func(*args, **kwargs)
+            except Exception as message:
+                logging.exception(message)
+        # keep the pipe open
+        return True
+
+
+class RedrawScheduler(object):
+    """
+    Coalesce redraw requests into at most one repaint per frame interval.
+
+    Redraws can be requested from any thread with :meth:`request`; they are
+    executed in the thread of the urwid main loop through a
+    :class:`MainLoopDispatcher`.
+    """
+
+    def __init__(self, redraw, dispatcher):
+        self.redraw = redraw
+        self.dispatcher = dispatcher
+        self.dirty = False
+        self._last_redraw = 0
+        self._lock = threading.Lock()
+
+    @property
+    def frame_interval(self):
+        max_frame_rate = configuration.styles.get('max_frame_rate', 0)
+        return 1.0 / max_frame_rate if max_frame_rate > 0 else 0
+
+    def request(self):
+        """Mark the screen as dirty and schedule a redraw if needed."""
+        with self._lock:
+            if self.dirty:
+                return
+            self.dirty = True
+
+        self.dispatcher.call(self._schedule)
+
+    def _schedule(self):
+        loop = self.dispatcher.loop
+        delay = self._last_redraw + self.frame_interval - time()
+        if loop is not None and delay > 0:
+            loop.set_alarm_in(delay, self._run)
+        else:
+            self._run()
+
+    def _run(self, *args):
+        with self._lock:
+            self.dirty = False
+        self._last_redraw = time()
+        self.redraw()
+
+
+class PollingScheduler(object):
+    """
+    Decide when each timeline is updated.
+
+    Timelines start being updated every ``update_frequency`` seconds. The
+    interval of a timeline doubles every time an update brings no statuses,
+    up to :data:`MAX_BACKOFF` times the update frequency. An update with new
+    statuses brings it back to the update frequency, or halves it (down to
+    half the update frequency) if the update brought a full page. Timelines
+    that aren't visible are updated :data:`BACKGROUND_FACTOR` times less
+    often.
+
+    The timelines in `overrides` are updated every fixed number of seconds.
+    """
+
+    def __init__(self, overrides=None):
+        self.overrides = overrides if overrides is not None else {}
+        self._intervals = {}
+        self._due = {}
+
+    @property
+    def update_frequency(self):
+        return configuration.twitter['update_frequency']
+
+    def interval(self, timeline):
+        """Return the seconds between updates of `timeline`."""
+        if timeline in self.overrides:
+            return self.overrides[timeline]
+        return self._intervals.get(timeline, self.update_frequency)
+
+    def _delay(self, timeline, visible):
+        interval = self.interval(timeline)
+        return interval if visible else interval * BACKGROUND_FACTOR
+
+    def due_timelines(self, timeline_list, now):
+        """
+        Return the timelines of `timeline_list` that should be updated at
+        `now`. Timelines that weren't known are scheduled for later.
+        """
+        visible = timeline_list.visible_timelines
+        timelines = list(timeline_list)
+
+        for timeline in list(self._due):
+            if timeline not in timelines:
+                del self._due[timeline]
+                self._intervals.pop(timeline, None)
+
+        due = []
+        for timeline in timelines:
+            if timeline in self._due and self._due[timeline] > now:
+                continue
+            if timeline in self._due:
+                due.append(timeline)
+            self._due[timeline] = now + self._delay(timeline,
+                                                    timeline in visible)
+        return due
+
+    def polled(self, timeline, new_statuses, visible, now):
+        """
+        Adapt the interval of `timeline` after an update that brought
+        `new_statuses` statuses at `now`.
+        """
+        if timeline not in self.overrides:
+            update_frequency = self.update_frequency
+            interval = self.interval(timeline)
+            if not new_statuses:
+                interval = min(interval * 2, update_frequency * MAX_BACKOFF)
+            elif new_statuses >= (timeline.page_size or PAGE_SIZE):
+                interval = max(interval / 2, update_frequency / 2)
+            else:
+                interval = update_frequency
+            self._intervals[timeline] = interval
+        self._due[timeline] = now + self._delay(timeline, visible)
+
+    def postpone(self, timeline, until):
+        """
+        Postpone the update of `timeline` until `until`, when the rate limit
+        of its endpoint allows it.
+        """
+        self._due[timeline] = max(self._due.get(timeline, until), until)
+
+    def next_poll(self):
+        """Return when the next update is due or ``None``."""
+        return min(self._due.values()) if self._due else None
+
+
 class InputHandler:
     """
     Maps user input to calls to :class:`Controller` functions.
@@ -53,6 +259,7 @@ class InputHandler:
             'help':          self.controller.help_mode,
             'reload_config': self.controller.reload_configuration,
             'clear':         self.controller.clear_status,
+            'rate_limits':   self.controller.show_rate_limits,
         }
 
         self.MOTION_COMMANDS = {
@@ -235,6 +442,19 @@ def has_timelines(func):
     return wrapper
 
 
+def in_main_loop(func):
+    """
+    `func` is executed in the thread of the main loop, calls from other
+    threads are handed off to the controller's dispatcher.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.dispatcher.in_loop_thread():
+            return func(self, *args, **kwargs)
+        self.dispatcher.call(func, self, *args, **kwargs)
+    return wrapper
+
+
 def text_from_editor(func):
     """
     `func` receives text from an editor.
@@ -275,9 +495,18 @@ class Controller(Observer):
         # Load session
         self.session = Session(self.api)
         self.session.populate(self.timelines)
+        self.cache = StatusCache(configuration.cache_file,
+                                 configuration.session,
+                                 configuration.twitter['cache_size'])
 
         self.editor = None
 
+        self.dispatcher = MainLoopDispatcher()
+        self.redraw_scheduler = RedrawScheduler(self.draw_timelines,
+                                                self.dispatcher)
+        self.polling = PollingScheduler(self.session.update_frequencies)
+        self._update_alarm = None
+
         # Default Mode
         self.mode = self.INFO_MODE
 
@@ -303,29 +532,81 @@ class Controller(Observer):
     @async_thread
     def init_timelines(self):
         # API has to be authenticated
-        while (not self.api.is_authenticated):
-            pass
+        self.api.wait_until_authenticated()
 
         # fetch the authenticated user
         self.user = self.api.verify_credentials()
 
-        # initialize the timelines
+        # initialize the timelines, fetching the visible ones in parallel
+        # and the background buffers once all of them have been fetched
         self.info_message(_('Fetching timelines'))
 
-        for timeline in self.timelines:
-            timeline.update()
-            timeline.activate_first()
-
-        self.timeline_mode()
-        self.clear_status()
+        visible_timelines = self.timelines.visible_timelines
+        buffers = [timeline for timeline in self.timelines
+                   if timeline not in visible_timelines]
+        pending = len(visible_timelines)
 
-        # Main loop has to be running
-        while not getattr(self, 'loop'):
-            pass
+        def visible_timelines_fetched():
+            # leave the info mode even if no timeline could be fetched
+            self.update()
+            self.clear_status()
 
-        # update alarm
-        seconds = configuration.twitter['update_frequency']
-        self.loop.set_alarm_in(seconds, self.update_alarm)
+            for timeline in buffers:
+                self.refresh_timeline(timeline,
+                                      partial(self._timeline_initialized,
+                                              timeline),
+                                      timeline.newer_cursor(),
+                                      background=True)
+
+            self.update_alarm()
+
+        def visible_timeline_fetched(future):
+            nonlocal pending
+            pending -= 1
+            if not pending:
+                visible_timelines_fetched()
+
+        for timeline in visible_timelines:
+            future = self.refresh_timeline(timeline,
+                                           partial(self._timeline_initialized,
+                                                   timeline),
+                                           timeline.newer_cursor())
+            future.add_done_callback(
+                partial(self.dispatcher.call, visible_timeline_fetched))
+        if not visible_timelines:
+            self.dispatcher.call(visible_timelines_fetched)
+
+    def _timeline_initialized(self, timeline):
+        """Show `timeline` after fetching its statuses for the first time."""
+        timeline.activate_first()
+        # switches to timeline mode when the first timeline arrives
+        self.update()
+
+    def load_cache(self):
+        """Add the cached statuses to the timelines of the session."""
+        cached = self.cache.load()
+        for timeline, name in self.session.timeline_names.items():
+            statuses = cached.get(name)
+            if statuses:
+                timeline.add_statuses(statuses)
+                timeline.activate_first()
+
+    def _cached_timelines(self):
+        return dict((name, list(timeline))
+                    for timeline, name in self.session.timeline_names.items()
+                    if timeline in self.timelines)
+
+    def save_cache(self):
+        """Save the statuses of the timelines of the session in the cache."""
+        self.cache.save(self._cached_timelines())
+
+    def cache_alarm(self, *args, **kwargs):
+        """
+        Save the statuses of the session in the cache from a worker, so they
+        aren't lost if ``turses`` doesn't exit cleanly.
+        """
+        worker_pool.submit(self.cache.save, self._cached_timelines())
+        self.loop.set_alarm_in(CACHE_SAVE_INTERVAL, self.cache_alarm)
 
     def main_loop(self):
         """
@@ -340,6 +621,13 @@ class Controller(Observer):
                 handle_mouse=True,
                 unhandled_input=self.input_handler.handle,
                 input_filter=self.input_handler.filter_input)
+            self.dispatcher.attach(self.loop)
+            self.loop.set_alarm_in(CLOCK_TICK, self.clock_alarm)
+            self.loop.set_alarm_in(CACHE_SAVE_INTERVAL, self.cache_alarm)
+
+            # show the cached statuses while the timelines are fetched
+            self.load_cache()
+            self.update()
 
             # Authenticate API just before starting main loop
             self.authenticate_api()
@@ -358,6 +646,7 @@ class Controller(Observer):
 
     def exit(self):
         """Exit the program."""
+        self.save_cache()
         raise urwid.ExitMainLoop()
 
     # -- Observer -------------------------------------------------------------
@@ -369,7 +658,8 @@ class Controller(Observer):
         """
         if self.is_in_info_mode():
             self.timeline_mode()
-        self.draw_timelines()
+        else:
+            self.redraw_scheduler.request()
 
     # -- Callbacks ------------------------------------------------------------
 
@@ -378,13 +668,36 @@ class Controller(Observer):
         self.error_message(_('Couldn\'t initialize API'))
 
     def update_alarm(self, *args, **kwargs):
-        self.update_all_timelines()
+        due = self.polling.due_timelines(self.timelines, time())
+        if due:
+            self.update_timelines(due, background=True)
+        self._set_update_alarm()
+
+    def clock_alarm(self, *args, **kwargs):
+        """Refresh the relative times of the statuses being displayed."""
+        if self.is_in_timeline_mode():
+            self.ui.refresh_headers()
+        self.loop.set_alarm_in(CLOCK_TICK, self.clock_alarm)
+
+    def _set_update_alarm(self):
+        """Set the alarm for the next timeline update that is due."""
+        if not hasattr(self, 'loop'):
+            return
 
-        seconds = configuration.twitter['update_frequency']
-        self.loop.set_alarm_in(seconds, self.update_alarm)
+        if self._update_alarm is not None:
+            self.loop.remove_alarm(self._update_alarm)
+
+        next_poll = self.polling.next_poll()
+        if next_poll is None:
+            seconds = configuration.twitter['update_frequency']
+        else:
+            seconds = max(next_poll - time(), 1)
+        self._update_alarm = self.loop.set_alarm_in(seconds,
+                                                    self.update_alarm)
 
     # -- Modes ----------------------------------------------------------------
 
+    @in_main_loop
     def timeline_mode(self):
         """
         Activates the Timeline mode if there are Timelines.
@@ -461,13 +774,13 @@ class Controller(Observer):
         arguments to the update function, it creates the timeline and
         appends it to `timelines`.
         """
-        timeline = Timeline(name=name,
-                            update_function=update_function,
-                            update_function_args=update_args,
-                            update_function_kwargs=update_kwargs)
+        timeline = create_timeline(name=name,
+                                   update_function=update_function,
+                                   update_function_args=update_args,
+                                   update_function_kwargs=update_kwargs)
         timeline.update()
         timeline.activate_first()
-        self.timelines.append_timeline(timeline)
+        self.dispatcher.call(self.timelines.append_timeline, timeline)
 
     def append_home_timeline(self):
         timeline_fetched = partial(self.info_message,
@@ -605,17 +918,176 @@ class Controller(Observer):
                              on_error=timeline_not_created,
                              on_success=timeline_created)
 
-    @async_thread
+    def _update_timeline(self, timeline, callback=None, cursor=None,
+                         background=False):
+        """
+        Fetch the statuses of `timeline` selected by `cursor` in the calling
+        thread and hand them off to the main loop, where they are added to the
+        timeline and `callback` (if given) is called. When `background` is
+        true the requests yield to the ones made on behalf of the user and
+        :class:`~turses.api.ratelimit.RateLimited` is raised when they can't
+        be made yet, so the update is rescheduled; otherwise the user is told
+        when the timeline can be fetched.
+
+        Return a tuple with the number of statuses fetched, or ``None`` if
+        they could not be fetched, and the seconds spent fetching them.
+        """
+        if background:
+            requests = background_requests()
+        else:
+            requests = interactive_requests()
+        started = time()
+        try:
+            with requests:
+                statuses = timeline.fetch(cursor)
+                if cursor is not None and cursor.is_polling:
+                    statuses = self._backfill(timeline, statuses, cursor)
+        except RateLimited as error:
+            if background:
+                raise
+            self.rate_limit_message(error)
+            return None, time() - started
+        except Exception as message:
+            logging.exception(message)
+            return None, time() - started
+        elapsed = time() - started
+
+        def add_statuses():
+            if statuses is not None:
+                timeline.update_callback(statuses)
+            if callable(callback):
+                callback()
+
+        self.dispatcher.call(add_statuses)
+        fetched = len(statuses) if isinstance(statuses, list) else 0
+        return fetched, elapsed
+
+    def _backfill(self, timeline, statuses, cursor):
+        """
+        Given the `statuses` fetched for `timeline` with a polling `cursor`,
+        fetch the older pages while they come back with `count` statuses,
+        since there may be a gap between the oldest status and the `since_id`
+        of the cursor. Cursors without a `count` aren't backfilled.
+        """
+        if not isinstance(statuses, list) or not cursor.count:
+            return statuses
+
+        page = statuses
+        for page_number in range(MAX_BACKFILL_PAGES):
+            if len(page) < cursor.count:
+                break
+            oldest_id = min(status.id for status in page)
+            logging.debug('filling gap in %s older than %s',
+                          timeline.name, oldest_id)
+            try:
+                page = timeline.fetch(cursor.older_than(oldest_id))
+            except RateLimited as message:
+                logging.info('gap in %s left unfilled: %s', timeline.name,
+                             message)
+                break
+            statuses.extend(page)
+        return statuses
+
+    def _timeline_updated(self, timeline):
+        self.redraw_scheduler.request()
+        self.info_message(_('%s updated' % timeline.name))
+
+    def refresh_timeline(self, timeline, callback=None, cursor=None,
+                         background=False):
+        """
+        Update `timeline` in a worker thread, as :meth:`_update_timeline`
+        does. A refresh of a timeline that is already being refreshed is
+        merged with the one in flight.
+
+        Return a :class:`concurrent.futures.Future`.
+        """
+        return worker_pool.submit_once((timeline, 'refresh'),
+                                       self._update_timeline,
+                                       timeline,
+                                       callback,
+                                       cursor,
+                                       background)
+
     def update_all_timelines(self):
-        for timeline in self.timelines:
-            timeline.update()
-            self.draw_timelines()
-            self.info_message(_('%s updated' % timeline.name))
-        self.redraw_screen()
-        self.clear_status()
+        """
+        Refresh all the timelines concurrently.
+
+        Return a list with a :class:`concurrent.futures.Future` per timeline.
+        """
+        return self.update_timelines(list(self.timelines))
+
+    def update_timelines(self, timelines, background=False):
+        """
+        Refresh `timelines` concurrently, adding the statuses of each timeline
+        as soon as they arrive and adapting its polling interval to the number
+        of statuses that were new to it. Periodic updates are made as
+        `background` requests.
+
+        Each timeline reports the time spent fetching it, which doesn't
+        include the time its refresh waited for a worker, and the batch
+        reports the time until every timeline was refreshed. Background
+        updates that are rate limited are postponed until they can be made.
+
+        Return a list with a :class:`concurrent.futures.Future` per timeline.
+        """
+        pending = len(timelines)
+        started = time()
+        added_counts = dict((timeline, timeline.added_count)
+                            for timeline in timelines)
+
+        def timeline_refreshed(timeline, future):
+            nonlocal pending
+            pending -= 1
+            error = future.exception()
+            if isinstance(error, RateLimited):
+                logging.info('%s postponed: %s', timeline.name, error)
+                self.polling.postpone(timeline, error.retry_at)
+                message = _('%s postponed') % timeline.name
+            else:
+                fetched, elapsed = future.result()
+                if fetched is not None:
+                    logging.info('%s fetched in %.2fs', timeline.name,
+                                 elapsed)
+                    self.redraw_scheduler.request()
+                    message = (_('%s updated (%.1fs)') %
+                               (timeline.name, elapsed))
+                else:
+                    # keep the error shown by the update
+                    logging.info('%s failed to update', timeline.name)
+                    message = None
+
+                # the statuses are added to the timeline before the refresh
+                # is reported in the main loop
+                if fetched is not None:
+                    new_statuses = (timeline.added_count -
+                                    added_counts[timeline])
+                else:
+                    new_statuses = None
+                visible = timeline in self.timelines.visible_timelines
+                self.polling.polled(timeline, new_statuses, visible, time())
+            self._set_update_alarm()
+
+            if pending:
+                if message:
+                    self.info_message(message)
+            else:
+                total = time() - started
+                logging.info('timelines updated in %.2fs', total)
+                self.info_message(_('Timelines updated (%.1fs)') % total)
+
+        futures = []
+        for timeline in timelines:
+            future = self.refresh_timeline(timeline,
+                                           cursor=timeline.newer_cursor(),
+                                           background=background)
+            future.add_done_callback(
+                partial(self.dispatcher.call, timeline_refreshed, timeline))
+            futures.append(future)
+        return futures
 
     # -- Timeline mode --------------------------------------------------------
 
+    @in_main_loop
     def draw_timelines(self):
         if not self.is_in_timeline_mode():
             return
@@ -657,23 +1129,17 @@ class Controller(Observer):
     def mark_all_as_read(self):
         """Mark all statuses in active timeline as read."""
         active_timeline = self.timelines.active
-        for tweet in active_timeline:
-            tweet.read = True
+        active_timeline.mark_all_as_read()
         self.update_header()
 
-    @async_thread
     def update_active_timeline(self):
         """Update the active timeline and draw the timeline buffers."""
         if self.timelines.has_timelines():
             active_timeline = self.timelines.active
-            try:
-                newest = active_timeline[0]
-            except IndexError:
-                return
-            active_timeline.update(since_id=newest.id)
-            if self.is_in_timeline_mode():
-                self.draw_timelines()
-            self.info_message('%s updated' % active_timeline.name)
+            return self.refresh_timeline(active_timeline,
+                                         partial(self._timeline_updated,
+                                                 active_timeline),
+                                         active_timeline.newer_cursor())
 
     @async_thread
     def update_active_timeline_with_newer_statuses(self):
@@ -683,7 +1149,9 @@ class Controller(Observer):
         active_timeline = self.timelines.active
         active_status = active_timeline.active
         if active_status:
-            active_timeline.update(since_id=active_status.id)
+            self._update_timeline(active_timeline,
+                                  self.redraw_scheduler.request,
+                                  Cursor(since_id=active_status.id))
 
     @async_thread
     def update_active_timeline_with_older_statuses(self):
@@ -693,8 +1161,11 @@ class Controller(Observer):
         active_timeline = self.timelines.active
         active_status = active_timeline.active
         if active_status:
-            active_timeline.update(max_id=active_status.id)
+            self._update_timeline(active_timeline,
+                                  self._older_statuses_fetched,
+                                  active_timeline.older_cursor(active_status))
 
+    def _older_statuses_fetched(self):
         # Center focus in order to make the fetched tweets visible
         self.draw_timelines()
         self.ui.center_focus()
@@ -791,22 +1262,38 @@ class Controller(Observer):
 
     # -- Footer ---------------------------------------------------------------
 
+    @in_main_loop
     def error_message(self, message):
         self.ui.status_error_message(message)
         self.redraw_screen()
 
+    @in_main_loop
     def info_message(self, message):
         self.ui.status_info_message(message)
         self.redraw_screen()
 
+    @in_main_loop
     def clear_status(self):
         """Clear the status bar."""
         self.ui.clear_status()
         self.redraw_screen()
 
+    def rate_limit_message(self, error):
+        """
+        Tell the user when the request refused with the
+        :class:`~turses.api.ratelimit.RateLimited` `error` can be retried.
+        """
+        retry_at = strftime('%H:%M:%S', localtime(error.retry_at))
+        self.error_message(_('Rate limit exceeded, try again at %s') %
+                           retry_at)
+
     # -- UI -------------------------------------------------------------------
     def redraw_screen(self):
         if hasattr(self, "loop"):
+            if not self.dispatcher.in_loop_thread():
+                # the main loop draws the screen after the redraw
+                self.redraw_scheduler.request()
+                return
             try:
                 self.loop.draw_screen()
             except AssertionError as message:
@@ -1044,7 +1531,8 @@ class Controller(Observer):
         self._retweet(status)
 
     def _retweet(self, status):
-        retweet_posted = partial(self.info_message,
+        retweet_posted = partial(self._status_changed,
+                                 status,
                                  _('Retweet posted'))
         retweet_post_failed = partial(self.error_message,
                                       _('Failed to post retweet'))
@@ -1243,8 +1731,10 @@ class Controller(Observer):
     def _favorite(self, status):
         favorite_error = partial(self.error_message,
                                  _('Failed to mark tweet as favorite'))
-        favorite_done = partial(self.info_message,
-                                _('Tweet marked as favorite'))
+        favorite_done = partial(self._status_changed,
+                                status,
+                                _('Tweet marked as favorite'),
+                                is_favorite=True)
         self.api.create_favorite(on_error=favorite_error,
                                  on_success=favorite_done,
                                  status=status,)
@@ -1255,26 +1745,81 @@ class Controller(Observer):
 
         unfavorite_error = partial(self.error_message,
                                    _('Failed to remove tweet from favorites'))
-        unfavorite_done = partial(self.info_message,
-                                  _('Tweet removed from favorites'))
+        unfavorite_done = partial(self._status_changed,
+                                  status,
+                                  _('Tweet removed from favorites'),
+                                  is_favorite=False)
         self.api.destroy_favorite(on_error=unfavorite_error,
                                   on_success=unfavorite_done,
                                   status=status,)
 
+    @in_main_loop
+    def _status_changed(self, status, message, **attributes):
+        """
+        Update the given `attributes` of `status` after a successful
+        operation, discarding what has been rendered for it.
+
+        Called from the worker that performed the operation, so it is handed
+        off to the main loop.
+        """
+        for name, value in attributes.items():
+            setattr(status, name, value)
+        self.ui.invalidate_status(status)
+        self.info_message(message)
+
     @has_active_status
     def user_info(self):
         status = self.timelines.active_status
 
-        username = status.authors_username
-        user = self.api.get_user(username)
-        last_statuses = self.api.get_user_timeline(username)
+        self.info_message(_('Fetching @%s\'s info') % status.authors_username)
+        return self._fetch_user_info(status.authors_username)
+
+    @async_thread
+    def _fetch_user_info(self, username):
+        try:
+            user = self.api.get_user(username)
+            last_statuses = self.api.get_user_timeline(username)
+        except RateLimited as error:
+            self.rate_limit_message(error)
+            return
+        except Exception as message:
+            logging.exception(message)
+            self.error_message(_('Failed to fetch @%s\'s info') % username)
+            return
+        self._show_user_info(user, last_statuses)
+
+    @in_main_loop
+    def _show_user_info(self, user, last_statuses):
+        self.clear_status()
         self.ui.show_user_info(user, last_statuses)
         self.user_info_mode(user)
 
+    # - Debug -----------------------------------------------------------------
+
+    def show_rate_limits(self):
+        """Show the remaining requests of each Twitter API endpoint."""
+        rate_limiter = getattr(self.api, 'rate_limiter', None)
+        quotas = rate_limiter.quotas() if rate_limiter else {}
+        if not quotas:
+            self.info_message(_('No rate limits reported yet'))
+            return
+
+        now = time()
+        template = '%s %d/%d (%ds)'
+        rate_limits = [template % (endpoint,
+                                   quota.remaining,
+                                   quota.limit,
+                                   max(quota.reset - now, 0))
+                       for endpoint, quota in sorted(quotas.items())]
+        logging.debug('rate limits: %s', ', '.join(rate_limits))
+        self.info_message(', '.join(rate_limits))
+
     # - Configuration ---------------------------------------------------------
 
     def reload_configuration(self):
         configuration.reload()
+        self.ui.invalidate_timelines()
+        self.draw_timelines()
         self.redraw_screen()
         self.info_message(_('Configuration reloaded'))
 
@@ -5,8 +5,14 @@ This module contains abstract classes and decorators.
 """
 import logging
 from abc import ABCMeta, abstractmethod, abstractproperty
+from concurrent.futures import Future
 from functools import wraps
-from threading import Thread
+from queue import Queue
+from threading import Thread, RLock
+
+
+# maximum number of worker threads
+WORKERS = 8
 
 
 # - Decorators ----------------------------------------------------------------
@@ -42,13 +48,13 @@ def wrap_exceptions(func):
 
 def async_thread(func):
     """
-    Decorator for executing a function in a separate :class:`threading.Thread`.
+    Decorator for executing a function in the shared :class:`WorkerPool`.
+
+    The decorated function returns a :class:`concurrent.futures.Future`.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        thread = Thread(target=func, args=args, kwargs=kwargs)
-        thread.daemon = True
-        return thread.start()
+        return worker_pool.submit(func, *args, **kwargs)
     return wrapper
 
 
@@ -67,6 +73,80 @@ def filter_result(func, filter_func=None):
     return wrapper
 
 
+# - Worker pool ---------------------------------------------------------------
+
+
+class WorkerPool(object):
+    """
+    A bounded pool of daemon worker threads.
+
+    Functions are submitted with :meth:`submit` or :meth:`submit_once` and
+    executed by at most `size` threads, which are started when needed. Both
+    methods return a :class:`concurrent.futures.Future` with the result of
+    the call.
+    """
+
+    def __init__(self, size=WORKERS):
+        self.size = size
+        self._tasks = Queue()
+        self._threads = []
+        self._in_flight = {}
+        self._lock = RLock()
+
+    def submit(self, func, *args, **kwargs):
+        """Execute `func` with the given arguments in a worker thread."""
+        return self._submit(None, func, args, kwargs)
+
+    def submit_once(self, key, func, *args, **kwargs):
+        """
+        Like :meth:`submit`, but if a call submitted with the same `key` has
+        not finished yet, return its future instead of submitting `func`.
+        """
+        return self._submit(key, func, args, kwargs)
+
+    def _submit(self, key, func, args, kwargs):
+        with self._lock:
+            if key is not None and key in self._in_flight:
+                return self._in_flight[key]
+
+            future = Future()
+            if key is not None:
+                self._in_flight[key] = future
+            self._tasks.put((key, future, func, args, kwargs))
+
+            if len(self._threads) < self.size:
+                thread = Thread(target=self._work)
+                thread.daemon = True
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def _work(self):
+        while True:
+            key, future, func, args, kwargs = self._tasks.get()
+            if not future.set_running_or_notify_cancel():
+                self._finished(key, future)
+                continue
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exception:
+                logging.exception(exception)
+                self._finished(key, future)
+                future.set_exception(exception)
+            else:
+                self._finished(key, future)
+                future.set_result(result)
+
+    def _finished(self, key, future):
+        with self._lock:
+            if key is not None and self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+
+worker_pool = WorkerPool()
+
+
 # - Abstract classes ----------------------------------------------------------
 
 # FIXME: Use urwid.MonitoredFocusList
@@ -152,6 +232,42 @@ class UnsortedActiveList(ActiveList):
         pass
 
 
+class Cursor(object):
+    """
+    The paging parameters of a single request made by an
+    :class:`~turses.meta.Updatable`: at most `count` statuses newer than
+    `since_id` and not newer than `max_id`. The parameters that are not set
+    are not sent.
+    """
+
+    __slots__ = ('since_id', 'max_id', 'count')
+
+    def __init__(self, since_id=None, max_id=None, count=None):
+        self.since_id = since_id
+        self.max_id = max_id
+        self.count = count
+
+    @property
+    def is_polling(self):
+        """Whether the cursor asks for the newest statuses after `since_id`."""
+        return self.since_id is not None and self.max_id is None
+
+    def older_than(self, status_id):
+        """Return a cursor for the page before `status_id`."""
+        return Cursor(since_id=self.since_id,
+                      max_id=status_id - 1,
+                      count=self.count)
+
+    def as_kwargs(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__
+                    if getattr(self, name) is not None)
+
+    def __repr__(self):
+        return 'Cursor(since_id=%r, max_id=%r, count=%r)' % (self.since_id,
+                                                             self.max_id,
+                                                             self.count)
+
+
 class Updatable(metaclass=ABCMeta):
     """
     An abstract class for making a class *updatable*.
@@ -186,20 +302,35 @@ class Updatable(metaclass=ABCMeta):
         else:
             self._kwargs = {}
 
-    @wrap_exceptions
-    def update(self, **extra_kwargs):
+    def fetch(self, cursor=None, **extra_kwargs):
         """
-        Update the object. The result of `update_function` is passed to the
-        `update_callback` function.
+        Return the result of calling `update_function` without updating the
+        object, or ``None`` if there is no `update_function`.
+
+        The paging parameters of the given :class:`~turses.meta.Cursor` and
+        `extra_kwargs` are only used for this call.
         """
         if not self.update_function:
             return
 
         args = self._args
-        kwargs = self._kwargs
+        kwargs = dict(self._kwargs)
+        if cursor is not None:
+            kwargs.update(cursor.as_kwargs())
         kwargs.update(extra_kwargs)
 
-        result = self.update_function(*args, **kwargs)
+        return self.update_function(*args, **kwargs)
+
+    @wrap_exceptions
+    def update(self, cursor=None, **extra_kwargs):
+        """
+        Update the object. The result of `update_function` is passed to the
+        `update_callback` function.
+        """
+        if not self.update_function:
+            return
+
+        result = self.fetch(cursor, **extra_kwargs)
 
         self.update_callback(result)
 
@@ -5,18 +5,28 @@ the Twitter entities represented into it.
 """
 
 import time
-from bisect import insort
+import logging
+from bisect import insort, bisect_left
+from collections import OrderedDict
+from datetime import datetime
 from calendar import timegm
 from functools import total_ordering
+from heapq import merge
+from operator import itemgetter
+from re import compile as compile_regex
 
 from turses.meta import (ActiveList, UnsortedActiveList, Updatable, Observable,
-                         notify)
-from turses.utils import prepend_at, sanitize_username, is_hashtag
+                         Cursor, notify)
+from turses.utils import prepend_at
 
 
 TWEET_MAXIMUM_CHARACTERS = 280
 STATUS_URL_TEMPLATE = 'https://twitter.com/{user}/status/{id}'
 
+# number of statuses after the active one that are never evicted from a
+# bounded `Timeline`
+PINNED_STATUSES = 20
+
 
 def is_DM(status):
     return status.__class__ == DirectMessage
@@ -32,8 +42,107 @@ def is_valid_search_text(text):
     return bool(text)
 
 
-def timestamp_from_datetime(datetime):
-    return timegm(datetime.utctimetuple())
+def timestamp_from_datetime(date_time):
+    """
+    Return the seconds elapsed since the epoch until `date_time`, which is
+    assumed to be in UTC when naive.
+    """
+    return timegm(date_time.utctimetuple()) + date_time.microsecond / 1e6
+
+
+def epoch(created_at):
+    """
+    Return the creation time `created_at` of a status, a datetime or a
+    timestamp, as the seconds elapsed since the epoch.
+    """
+    if isinstance(created_at, datetime):
+        return timestamp_from_datetime(created_at)
+    return created_at
+
+
+# buckets of the relative time of statuses as ``(limit, unit, singular,
+# plural)`` tuples, where `limit` is the elapsed time below which the bucket
+# applies and `unit` the seconds counted by the plural text (if any)
+_FUDGE = 1.25
+RELATIVE_TIME_BUCKETS = (
+    (1 * _FUDGE, None, 'a second ago', None),
+    (60 / _FUDGE, 1, None, '%d seconds ago'),
+    (60 * _FUDGE, None, 'a minute ago', None),
+    (60 * 60 / _FUDGE, 60, None, '%d minutes ago'),
+    (60 * 60 * _FUDGE, None, 'an hour ago', None),
+    (60 * 60 * 24 / _FUDGE, 60 * 60, None, '%d hours ago'),
+    (60 * 60 * 24 * _FUDGE, None, 'a day ago', None),
+    (float('inf'), 60 * 60 * 24, None, '%d days ago'),
+)
+
+
+def relative_time(timestamp, now):
+    """
+    Return a tuple with a human readable string representing the time elapsed
+    from `timestamp` until `now` and the time at which the string changes.
+
+    >>> relative_time(0, 150)
+    ('2 minutes ago', 180)
+    """
+    # This code is borrowed from `python-twitter` library
+    delta = now - timestamp
+    for limit, unit, singular, plural in RELATIVE_TIME_BUCKETS:
+        if delta < limit:
+            break
+
+    if unit is None:
+        return singular, timestamp + limit
+
+    count = int(delta / unit)
+    return plural % count, timestamp + min((count + 1) * unit, limit)
+
+
+# usernames and hashtags in the text of the statuses without entities
+tags_regex = compile_regex(r'(?<!\S)(?:@([A-Za-z0-9_]+)|(#\S+))')
+
+# kinds of entity spans
+MENTION, HASHTAG, URL = range(3)
+
+# indexes of the formats in the replacement of URL spans
+SHORTENED_URL, DISPLAY_URL, EXPANDED_URL = range(3)
+
+
+def entity_spans(entities):
+    """
+    Return a tuple with a ``(kind, start, end, replacement)`` span per entity
+    in the `entities` dictionary of a status, sorted by their position in the
+    text, or `None` if there are no entities.
+
+    The `kind` of a span is one of `MENTION`, `HASHTAG` or `URL`. The
+    `replacement` of URL spans is a tuple with the shortened, display and
+    expanded URLs, indexed by `SHORTENED_URL`, `DISPLAY_URL` and
+    `EXPANDED_URL`; the text of the rest of spans is not replaced and their
+    `replacement` is `None`.
+
+    >>> entity_spans({'hashtags': [{'indices': [7, 14], 'text': 'Python'}]})
+    ((1, 7, 14, None),)
+    """
+    if not entities:
+        return None
+
+    spans = []
+    for kind, name in ((MENTION, 'user_mentions'), (HASHTAG, 'hashtags')):
+        for entity in entities.get(name) or ():
+            start, end = entity['indices']
+            spans.append((kind, start, end, None))
+    for name in ('urls', 'media'):
+        for entity in entities.get(name) or ():
+            start, end = entity['indices']
+            display_url = entity.get('display_url')
+            if display_url:
+                replacement = (entity.get('url'),
+                               display_url,
+                               entity.get('expanded_url') or display_url)
+            else:
+                replacement = None
+            spans.append((URL, start, end, replacement))
+    spans.sort(key=itemgetter(1))
+    return tuple(spans) or None
 
 
 # -- Model --------------------------------------------------------------------
@@ -266,35 +375,61 @@ class TimelineList(UnsortedActiveList, Observable):
 # -- Twitter entities ---------------------------------------------------------
 
 
-class Timeline(ActiveList, Updatable):
+class Timeline(ActiveList, Updatable, Observable):
     """
     List of Twitter statuses ordered reversely by date, optionally with
     a name and a function that updates the current timeline and its arguments.
 
-    Its :class:`~turses.meta.Updatable` and implements the
-    :class:`~turses.meta.ActiveList` interface.
+    If a `capacity` is given, the oldest read statuses are evicted when the
+    timeline grows beyond it.
+
+    `page_size` is the number of statuses requested per page when polling
+    for newer statuses, or ``None`` if the update function merges several
+    pages in each call. A timeline that isn't `paged` has an update function
+    that ignores the paging parameters, and one that isn't `sorted_by_id`
+    adds statuses older than its newest one (e.g. favorites), so it is
+    polled for its whole first page.
+
+    Its :class:`~turses.meta.Updatable`, :class:`~turses.meta.Observable` and
+    implements the :class:`~turses.meta.ActiveList` interface.
     """
 
     def __init__(self,
                  name='',
                  statuses=None,
+                 capacity=None,
+                 page_size=None,
+                 paged=True,
+                 sorted_by_id=True,
                  **kwargs):
         ActiveList.__init__(self)
         Updatable.__init__(self, **kwargs)
+        Observable.__init__(self)
         self.name = name
-
+        self.capacity = capacity
+        self.page_size = page_size
+        self.paged = paged
+        self.sorted_by_id = sorted_by_id
+        self.added_count = 0
+        self.evicted_count = 0
+
+        # `statuses` is kept sorted and `_status_ids` maps each status id to
+        # its status, so membership checks don't need to scan the list
         self.statuses = []
+        self._status_ids = {}
+        self._unread_count = 0
         if statuses:
             self.add_statuses(statuses)
             self.activate_first()
             self.mark_active_as_read()
 
+    @notify
     def add_status(self, new_status):
         """
         Adds the given status to the status list of the Timeline if it's
         not already in it.
         """
-        if new_status in self.statuses:
+        if new_status.id in self._status_ids:
             return
 
         if self.active_index == self.NULL_INDEX:
@@ -310,31 +445,144 @@ class Timeline(ActiveList, Updatable):
             self.activate_next()
 
         insort(self.statuses, new_status)
+        self._status_ids[new_status.id] = new_status
+        self._track(new_status)
+        self.added_count += 1
+        self._evict()
 
+    @notify
     def add_statuses(self, new_statuses):
         """
         Adds the given new statuses to the status list of the Timeline
         if they are not already in it.
+
+        The new statuses are sorted once and merged with the existing ones in
+        a single pass, keeping the same status as the active one.
+
+        Return the number of statuses inserted.
         """
         if not new_statuses:
-            return
+            return 0
 
+        batch = {}
         for status in new_statuses:
-            self.add_status(status)
+            if status.id not in self._status_ids and status.id not in batch:
+                batch[status.id] = status
+
+        if not batch:
+            return 0
+
+        active = self.active
+        batch = sorted(batch.values())
+
+        self.statuses = list(merge(self.statuses, batch))
+        for status in batch:
+            self._status_ids[status.id] = status
+            self._track(status)
+
+        if active is None:
+            self.active_index = 0
+        else:
+            # shift the cursor by the number of statuses inserted above it
+            self.active_index += bisect_left(batch, active)
+
+        self.added_count += len(batch)
+        self._evict()
+        return len(batch)
+
+    def _evict(self):
+        """
+        Evict the oldest read statuses while the timeline holds more statuses
+        than its `capacity`.
+
+        The active status and the `PINNED_STATUSES` statuses that follow it
+        are never evicted.
+        """
+        if not self.capacity:
+            return
+
+        excess = len(self.statuses) - self.capacity
+        if excess <= 0:
+            return
+
+        first_evictable = max(self.active_index, 0) + PINNED_STATUSES + 1
+
+        kept = []
+        for status in reversed(self.statuses[first_evictable:]):
+            if excess and status.read:
+                excess -= 1
+                del self._status_ids[status.id]
+                self._untrack(status)
+                self.evicted_count += 1
+            else:
+                kept.append(status)
+        kept.reverse()
+
+        evicted = len(self.statuses) - first_evictable - len(kept)
+        if evicted > 0:
+            self.statuses[first_evictable:] = kept
+            logging.debug('%d statuses evicted from %s (%d in total)',
+                          evicted, self.name, self.evicted_count)
 
+    @notify
     def clear(self):
         """Clears the Timeline."""
+        for status in self.statuses:
+            self._untrack(status)
         self.active_index = self.NULL_INDEX
         self.statuses = []
+        self._status_ids = {}
+        self._unread_count = 0
+
+    def _track(self, status):
+        """
+        Subscribe to the changes of `status`'s `read` attribute to keep the
+        unread count up to date.
+        """
+        status._timelines += (self,)
+        if not status.read:
+            self._unread_count += 1
+
+    def _untrack(self, status):
+        status._timelines = tuple(timeline for timeline in status._timelines
+                                  if timeline is not self)
+
+    def _read_changed(self, status):
+        """Called by `status` when its `read` attribute changes."""
+        if status.read:
+            self._unread_count -= 1
+        else:
+            self._unread_count += 1
 
     @property
     def unread_count(self):
-        def one_if_unread(tweet):
-            if hasattr(tweet, 'read') and tweet.read:
-                return 0
-            return 1
+        return self._unread_count
+
+    @property
+    def newest_id(self):
+        """The id of the newest status in the timeline or ``None``."""
+        return self.statuses[0].id if self.statuses else None
 
-        return sum([one_if_unread(tweet) for tweet in self.statuses])
+    def newer_cursor(self):
+        """
+        Return a :class:`~turses.meta.Cursor` for fetching the statuses newer
+        than the ones in the timeline, or ``None`` if it isn't `paged`. The
+        cursor of a timeline that isn't `sorted_by_id` fetches its first page.
+        """
+        if not self.paged:
+            return
+        if not self.sorted_by_id:
+            return Cursor(count=self.page_size)
+        return Cursor(since_id=self.newest_id, count=self.page_size)
+
+    def older_cursor(self, status):
+        """
+        Return a :class:`~turses.meta.Cursor` for fetching `status` and the
+        statuses older than it, or ``None`` if the timeline isn't `paged`.
+        """
+        if not self.paged:
+            return
+        return Cursor(max_id=status.id)
 
     def mark_active_as_read(self):
         """Set active status' `read` attribute to `True`."""
@@ -355,6 +603,9 @@ class Timeline(ActiveList, Updatable):
     def __getitem__(self, key):
         return self.statuses[key]
 
+    def __contains__(self, status):
+        return status.id in self._status_ids
+
     # from `ActiveList`
 
     @property
@@ -391,7 +642,7 @@ class Timeline(ActiveList, Updatable):
     # from `Updatable`
 
     def update_callback(self, result):
-        self.add_statuses(result)
+        return self.add_statuses(result)
 
 
 class User:
@@ -399,6 +650,19 @@ class User:
     A Twitter user.
     """
 
+    __slots__ = (
+        'id',
+        'name',
+        'screen_name',
+        'description',
+        'url',
+        'created_at',
+        'friends_count',
+        'followers_count',
+        'favorites_count',
+        'status',
+    )
+
     def __init__(self,
                  id,
                  name,
@@ -428,6 +692,23 @@ class Status:
     A Twitter status.
     """
 
+    __slots__ = (
+        'id',
+        'created_at',
+        'user',
+        'text',
+        'is_reply',
+        'is_retweet',
+        'is_favorite',
+        'retweet_count',
+        'retweeted_status',
+        'author',
+        'spans',
+        '_tags',
+        '_read',
+        '_timelines',
+    )
+
     def __init__(self,
                  id,
                  created_at,
@@ -446,7 +727,7 @@ class Status:
                  # favorite
                  is_favorite=False,):
         self.id = id
-        self.created_at = created_at
+        self.created_at = epoch(created_at)
         self.user = user
         self.text = text
         self.is_reply = is_reply
@@ -455,31 +736,34 @@ class Status:
         self.retweet_count = retweet_count
         self.retweeted_status = retweeted_status
         self.author = author
-        self.entities = {} if entities is None else entities
+        self.spans = entity_spans(entities)
+        self._tags = None
+        self._read = False
+        self._timelines = ()
+
+    @property
+    def read(self):
+        return self._read
+
+    @read.setter
+    def read(self, read):
+        """
+        Mark the status as read or unread, letting know the timelines that
+        contain it.
+        """
+        read = bool(read)
+        if read == self._read:
+            return
+
+        self._read = read
+        for timeline in self._timelines:
+            timeline._read_changed(self)
 
     @property
     def relative_created_at(self):
         """Return a human readable string representing the posting time."""
-        # This code is borrowed from `python-twitter` library
-        fudge = 1.25
-        delta = time.time() - timestamp_from_datetime(self.created_at)
-
-        if delta < (1 * fudge):
-            return "a second ago"
-        elif delta < (60 * (1 / fudge)):
-            return "%d seconds ago" % (delta)
-        elif delta < (60 * fudge):
-            return "a minute ago"
-        elif delta < (60 * 60 * (1 / fudge)):
-            return "%d minutes ago" % (delta / 60)
-        elif delta < (60 * 60 * fudge) or delta / (60 * 60) == 1:
-            return "an hour ago"
-        elif delta < (60 * 60 * 24 * (1 / fudge)):
-            return "%d hours ago" % (delta / (60 * 60))
-        elif delta < (60 * 60 * 24 * fudge) or delta / (60 * 60 * 24) == 1:
-            return "a day ago"
-        else:
-            return "%d days ago" % (delta / (60 * 60 * 24))
+        relative_created_at, _ = relative_time(self.created_at, time.time())
+        return relative_created_at
 
     @property
     def url(self):
@@ -509,26 +793,47 @@ class Status:
         else:
             return self.user
 
+    def _extract_tags(self):
+        """
+        Return a tuple with the mentioned usernames and the hashtags of the
+        status, extracting them from its spans (or its text if it has no
+        spans) the first time.
+        """
+        if self._tags is None:
+            mentions, hashtags = [], []
+            text = self.text
+            if self.spans:
+                for kind, start, end, replacement in self.spans:
+                    if kind == MENTION:
+                        mentions.append(text[start + 1:end])
+                    elif kind == HASHTAG:
+                        hashtags.append(text[start:end])
+            elif text:
+                for mention, hashtag in tags_regex.findall(text):
+                    if mention:
+                        mentions.append(mention)
+                    else:
+                        hashtags.append(hashtag)
+            # remove repetitions keeping the order
+            self._tags = (tuple(OrderedDict.fromkeys(mentions)),
+                          tuple(OrderedDict.fromkeys(hashtags)))
+        return self._tags
+
     @property
     def mentioned_usernames(self):
         """
         Return mentioned usernames in `status` without '@'.
         """
-        # TODO: use self.entities if available
-        usernames = []
-        for word in self.text.split():
-            if len(word) > 1 and word.startswith('@'):
-                word.strip('@')
-                usernames.append(sanitize_username(word))
-        return list(set(usernames))
+        mentions, _ = self._extract_tags()
+        return list(mentions)
 
     @property
     def hashtags(self):
         """
         Return a list of hashtags encountered in `status`.
         """
-        # TODO: use self.entities
-        return filter(is_hashtag, self.text.split())
+        _, hashtags = self._extract_tags()
+        return list(hashtags)
 
     def dm_recipients_username(self, sender):
         """
@@ -567,6 +872,11 @@ class DirectMessage(Status):
     A Twitter direct message.
     """
 
+    __slots__ = (
+        'sender_screen_name',
+        'recipient_screen_name',
+    )
+
     def __init__(self,
                  id,
                  created_at,
@@ -575,11 +885,14 @@ class DirectMessage(Status):
                  text,
                  entities=None):
         self.id = id
-        self.created_at = created_at
+        self.created_at = epoch(created_at)
         self.sender_screen_name = sender_screen_name
         self.recipient_screen_name = recipient_screen_name
         self.text = text
-        self.entities = entities
+        self.spans = entity_spans(entities)
+        self._tags = None
+        self._read = False
+        self._timelines = ()
 
     @property
     def url(self):
@@ -591,6 +904,18 @@ class List:
     A Twitter list.
     """
 
+    __slots__ = (
+        'id',
+        'owner',
+        'created_at',
+        'name',
+        'slug',
+        'description',
+        'member_count',
+        'subscriber_count',
+        'private',
+    )
+
     def __init__(self,
                  id,
                  owner,
@@ -8,7 +8,7 @@ The file with the session declarations is located on
 the layout of a session. The ``defaults`` session is loaded when no other
 section is present.
 
-Each section has only two options:
+Each section has the following options:
 
     ``visible``
         contains the timelines that will be visible stacked in columns
@@ -16,8 +16,11 @@ Each section has only two options:
     ``buffers``
         contains the timelines that won't be visible but will be loaded
 
+    ``update_frequency``
+        overrides how often (in seconds) some of the timelines are updated
+
 .. warning:: The ``visible`` option must be present for any session but
-   ``buffers`` is optional.
+   ``buffers`` and ``update_frequency`` are optional.
 
 For each option, you will define the timelines as a comma-separated list of
 their names. Here is a list with the valid names:
@@ -44,6 +47,19 @@ background:
     visible = mentions, messages, search:turses, hashtag:turses
     buffer = home
 
+By default, the update frequency of each timeline adapts to how many new
+tweets it receives, starting from the ``update_frequency`` of the ``twitter``
+section of the configuration. You can set a fixed frequency for a timeline in
+the ``update_frequency`` option as a comma-separated list of
+``<timeline>=<seconds>`` pairs:
+
+.. code-block:: ini
+
+    [interactions]
+    visible = mentions, messages, search:turses, hashtag:turses
+    buffer = home
+    update_frequency = mentions=60, search:turses=600
+
 If you would like to load a session when starting ``turses``, you must provide
 the name of the session as a command-line argument. You can start the session
 named ``interactions`` by executing:
@@ -81,6 +97,7 @@ SESSIONS_FILE = path.join(CONFIG_PATH, 'sessions')
 
 VISIBLE = 'visible'
 BUFFERS = 'buffers'
+UPDATE_FREQUENCY = 'update_frequency'
 
 invalid_name_re = re.compile(r'^\s*$')
 
@@ -95,6 +112,21 @@ def clean_timeline_list_string(timeline_list_string):
             for name in timeline_names if not invalid_name_re.match(name)]
 
 
+def parse_update_frequencies(update_frequency_string):
+    """
+    Return a dictionary mapping timeline names to the update frequency (in
+    seconds) declared for them in `update_frequency_string`.
+    """
+    update_frequencies = {}
+    for pair in clean_timeline_list_string(update_frequency_string):
+        name, _, seconds = pair.rpartition('=')
+        try:
+            update_frequencies[name.strip()] = int(seconds)
+        except ValueError:
+            logging.error('Invalid update frequency: %s', pair)
+    return update_frequencies
+
+
 class Session:
     """Loads and saves sessions."""
 
@@ -108,9 +140,14 @@ class Session:
                 BUFFERS: ', '.join([MENTIONS_TIMELINE,
                                     FAVORITES_TIMELINE,
                                     MESSAGES_TIMELINE,
-                                    OWN_TWEETS_TIMELINE])
+                                    OWN_TWEETS_TIMELINE]),
+                UPDATE_FREQUENCY: '',
             }
         }
+        # names and update frequency overrides of the populated timelines
+        self.timeline_names = {}
+        self.update_frequencies = {}
+        self._update_frequencies_by_name = {}
         if not path.isfile(SESSIONS_FILE):
             # create the sessions file
             logging.info(_('Sessions file created'))
@@ -145,9 +182,16 @@ class Session:
         else:
             buffers = ''
 
+        if self.sessions_conf.has_option(session_name, UPDATE_FREQUENCY):
+            update_frequency = self.sessions_conf.get(session_name,
+                                                      UPDATE_FREQUENCY)
+        else:
+            update_frequency = ''
+
         self.sessions[session_name] = {
             VISIBLE: visible,
             BUFFERS: buffers,
+            UPDATE_FREQUENCY: update_frequency,
         }
 
     def populate(self, timeline_list, session=None):
@@ -166,6 +210,8 @@ class Session:
 
         visible_names = session_dict[VISIBLE]
         buffers_names = session_dict[BUFFERS]
+        self._update_frequencies_by_name = parse_update_frequencies(
+            session_dict[UPDATE_FREQUENCY])
 
         self.append_visible_timelines(visible_names, timeline_list)
         self.append_background_timelines(buffers_names, timeline_list)
@@ -179,14 +225,14 @@ class Session:
 
         # append first timeline (is always visible)
         first_timeline_name = visible_names.pop(0)
-        first_timeline = self.factory(first_timeline_name)
+        first_timeline = self.create_timeline(first_timeline_name)
 
         timeline_list.append_timeline(first_timeline)
 
         # append the rest of the visible timelines, expanding `timeline_list`
         # visible columns for showing the visible timelines
         for timeline_name in visible_names:
-            timeline_list.append_timeline(self.factory(timeline_name))
+            timeline_list.append_timeline(self.create_timeline(timeline_name))
             timeline_list.expand_visible_next()
 
     def append_background_timelines(self, buffers_string, timeline_list):
@@ -197,4 +243,17 @@ class Session:
         buffers_names = clean_timeline_list_string(buffers_string)
 
         for timeline_name in buffers_names:
-            timeline_list.append_timeline(self.factory(timeline_name))
+            timeline_list.append_timeline(self.create_timeline(timeline_name))
+
+    def create_timeline(self, timeline_name):
+        """
+        Create the timeline called `timeline_name`, recording its name in
+        :attr:timeline_names and its update frequency in
+        :attr:update_frequencies if the session overrides it.
+        """
+        timeline = self.factory(timeline_name)
+        self.timeline_names[timeline] = timeline_name
+        if timeline_name in self._update_frequencies_by_name:
+            seconds = self._update_frequencies_by_name[timeline_name]
+            self.update_frequencies[timeline] = seconds
+        return timeline
@@ -6,8 +6,9 @@ This module contains the curses UI widgets.
 import os
 import logging
 import re
+from collections import OrderedDict
 from gettext import gettext as _
-from html.entities import entitydefs
+from time import time
 
 
 from urwid import (AttrMap, WidgetWrap, Padding, Divider, SolidFill,
@@ -15,7 +16,7 @@ from urwid import (AttrMap, WidgetWrap, Padding, Divider, SolidFill,
 
                    # widgets
                    Text, Edit, Frame, Columns, Pile, ListBox, SimpleListWalker,
-                   Overlay,
+                   ListWalker, Overlay,
 
                    # signals
                    signals, emit_signal, connect_signal, disconnect_signal)
@@ -26,8 +27,24 @@ from turses.config import (MOTION_KEY_BINDINGS, BUFFERS_KEY_BINDINGS,
                            META_KEY_BINDINGS, TURSES_KEY_BINDINGS,
 
                            configuration)
-from turses.models import is_DM, TWEET_MAXIMUM_CHARACTERS
-from turses.utils import encode, is_hashtag, is_username, is_url
+from turses.meta import Observable
+from turses.models import (is_DM, relative_time, TWEET_MAXIMUM_CHARACTERS,
+                           SHORTENED_URL, DISPLAY_URL, EXPANDED_URL)
+from turses.utils import encode
+
+
+# number of `StatusWidget`s that each timeline keeps built
+STATUS_WIDGET_CACHE_SIZE = 100
+
+# number of statuses whose rendered text is kept in the `render_cache`
+RENDER_CACHE_SIZE = 2000
+
+# replacement of the URL spans for each `url_format` style
+URL_FORMATS = {
+    'shortened': SHORTENED_URL,
+    'display': DISPLAY_URL,
+    'original': EXPANDED_URL,
+}
 
 
 def surround_with_spaces(s):
@@ -35,36 +52,18 @@ def surround_with_spaces(s):
 
 
 # - Text parsing --------------------------------------------------------------
-def apply_attribute(string,
-                    hashtag='hashtag',
-                    attag='attag',
-                    url='url'):
-    """
-    Apply an attribute to `string` dependending on wether it is
-    a hashtag, a Twitter username or an URL.
-
-    >>> apply_attribute('#Python')
-    ('hashtag', u'#Python')
-    >>> apply_attribute('@dialelo')
-    ('attag', u'@dialelo')
-    >>> apply_attribute('@dialelo',
-                        attag='username')
-    ('username', u'@dialelo')
-    >>> apply_attribute('http://www.dialelo.com')
-    ('url', u'http://www.dialelo.com')
-    >>> apply_attribute('turses')
-    u'turses'
-    """
-    string = str(string)
 
-    if is_hashtag(string):
-        return (hashtag, string)
-    elif string.startswith('@') and is_username(string[1:]):
-        return (attag, string)
-    elif is_url(string):
-        return (url, string)
-    else:
-        return string
+# hashtags, usernames and URLs delimited by whitespace, the URL characters are
+# the ones matched by `turses.utils.URL_REGEX` collapsed into a single class
+attributes_regex = re.compile(r"""
+    (?<!\S)
+    (?:
+        (\#\S+)                       # hashtag
+      | (@[A-Za-z0-9_]+)               # username
+      | (https?://[!$-_a-z]+)          # URL
+    )
+    (?!\S)
+""", re.VERBOSE)
 
 
 def parse_attributes(text,
@@ -85,88 +84,24 @@ def parse_attributes(text,
     if not text:
         return u''
 
-    words = text.split()
-    parsed_text = [apply_attribute(word) for word in words]
-
-    def add_withespace(parsed_word):
-        if isinstance(parsed_word, tuple):
-            # is an (attr, word) tuple
-            return parsed_word
-        else:
-            return parsed_word + ' '
-
-    tweet = [add_withespace(parsed_word) for parsed_word in parsed_text]
-
-    # insert spaces after an attribute
-    indices = []
-    for i, word in enumerate(tweet[:-1]):
-        word_is_attribute = isinstance(word, tuple)
-
-        if word_is_attribute:
-            indices.append(i + 1 + len(indices))
+    # attributes indexed by the number of the matched group
+    attributes = (None, hashtag, attag, url)
 
-    for index in indices:
-        tweet.insert(index, u' ')
+    tweet = []
+    index = 0
+    for match in attributes_regex.finditer(text):
+        starts, ends = match.span()
+        if starts > index:
+            tweet.append(text[index:starts])
+        tweet.append((attributes[match.lastindex], match.group()))
+        index = ends
 
-    # remove trailing withespace
-    if tweet and isinstance(tweet[-1], str):
-        tweet[-1] = tweet[-1][:-1]
+    if index < len(text):
+        tweet.append(text[index:])
 
     return tweet
 
 
-def extract_attributes(entities, hashtag, attag, url):
-    """
-    Extract attributes from entities.
-
-    Return a list with (`attr`, string[, replacement]) tuples for each
-    entity in the status.
-    """
-    def map_attr(attr, entity_list):
-        """
-        Return a list with (`attr`, string) tuples for each string in
-        `entity_list`.
-        """
-        url_format = configuration.styles['url_format']
-        attributes = []
-        for entity in entity_list:
-            # urls are a special case, we change the URL shortened by
-            # Twitter (`http://t.co/*`) by the URL returned in
-            # `display_url`
-            indices = entity.get('indices')
-            is_url = entity.get('display_url', False)
-
-            if is_url:
-                # `display_url` is the default
-                url = entity.get('display_url')
-                if url_format == 'shortened':
-                    url = entity.get('url')
-                elif url_format == 'original' and 'expanded_url' in entity:
-                    url = entity.get('expanded_url')
-                mapping = (attr, indices, url)
-            else:
-                mapping = (attr, indices)
-            attributes.append(mapping)
-        return attributes
-
-    entity_names_and_attributes = [
-        ('user_mentions', attag),
-        ('hashtags', hashtag),
-        ('urls', url),
-        ('media', url),
-    ]
-
-    attributes = []
-    for entity_name, entity_attribute in entity_names_and_attributes:
-        entity_list = entities.get(entity_name, [])
-        attributes.extend(map_attr(entity_attribute, entity_list))
-
-    # sort mappings to split the text in order
-    attributes.sort(key=lambda mapping: mapping[1][0])
-
-    return attributes
-
-
 def map_attributes(status, hashtag, attag, url):
     """
     Return a list of strings and tuples for hashtag, attag and
@@ -188,51 +123,38 @@ def map_attributes(status, hashtag, attag, url):
         # call this method on the retweeted status
         return map_attributes(status.retweeted_status, hashtag, attag, url)
 
-    if not status.entities:
+    if not status.spans:
         # no entities defined, parse text *manually*
         #  - Favorites don't include any entities at the time of writing
-        text = status.retweeted_status.text if is_retweet else status.text
-        return parse_attributes(text, hashtag, attag, url)
+        return parse_attributes(status.text, hashtag, attag, url)
 
-    # we have entities, extract the (attr, string[, replacement]) tuples
-    assert status.entities
-    attribute_mappings = extract_attributes(entities=status.entities,
-                                            hashtag=hashtag,
-                                            attag=attag,
-                                            url=url)
+    # attributes indexed by the kind of span
+    attributes = (attag, hashtag, url)
+    url_format = URL_FORMATS.get(configuration.styles['url_format'],
+                                 DISPLAY_URL)
 
     text = []
     status_text = str(status.text)
     # start from the beggining
     index = 0
-    for mapping in attribute_mappings:
-        attribute = mapping[0]
-        starts, ends = mapping[1]
-
-        # this text has an attribute associated
-        entity_text = status_text[starts:ends]
-
-        if attribute == url and len(mapping) == 3:
-            # if the text is a url and a third element is included in the
-            # tuple; the third element is the original URL
-            entity_text = mapping[2]
-
+    for kind, starts, ends, replacement in status.spans:
         # append normal text before the text with an attribute
-        normal_text = status_text[index:starts]
-        if normal_text:
-            text.append(normal_text)
+        if starts > index:
+            text.append(status_text[index:starts])
 
-        # append text with attribute
-        text_with_attribute = (attribute, entity_text)
-        text.append(text_with_attribute)
+        # URLs are replaced with the configured format
+        if replacement is None:
+            entity_text = status_text[starts:ends]
+        else:
+            entity_text = replacement[url_format]
+        text.append((attributes[kind], entity_text))
 
         # update index, continue from where the attribute text ends
         index = ends
 
     # after parsing all attributes we can have some text left
-    normal_text = status_text[index:]
-    if normal_text:
-        text.append(normal_text)
+    if index < len(status_text):
+        text.append(status_text[index:])
 
     return text
 
@@ -253,6 +175,9 @@ class CursesInterface(WidgetWrap):
     def __init__(self):
         self._editor = None
 
+        # the widgets of the visible timelines are kept between draws
+        self._timeline_widgets = {}
+
         # header
         header = TabsWidget()
 
@@ -292,8 +217,64 @@ class CursesInterface(WidgetWrap):
     # -- Modes ----------------------------------------------------------------
 
     def draw_timelines(self, timelines):
-        self.frame.body = TimelinesBuffer(timelines)
-        self.frame.set_body(self.frame.body)
+        """
+        Draw the given `timelines`, reusing the widgets of the timelines that
+        were already visible after refreshing the relative times of their
+        headers.
+        """
+        render_cache.tick()
+        timeline_widgets = {}
+        for timeline in timelines:
+            widget = self._timeline_widgets.pop(timeline, None)
+            if widget is None:
+                widget = TimelineWidget(timeline)
+            else:
+                widget.refresh_headers()
+            widget.sync()
+            timeline_widgets[timeline] = widget
+
+        # the timelines that are no longer visible are discarded
+        for widget in self._timeline_widgets.values():
+            widget.detach()
+        self._timeline_widgets = timeline_widgets
+
+        widgets = [timeline_widgets[timeline] for timeline in timelines]
+        if isinstance(self.frame.body, TimelinesBuffer):
+            self.frame.body.set_timeline_widgets(widgets)
+        else:
+            self.frame.body = TimelinesBuffer(timeline_widgets=widgets)
+            self.frame.set_body(self.frame.body)
+
+    def refresh_headers(self):
+        """
+        Refresh the relative times shown in the headers of the statuses of
+        the visible timelines, returning whether any of them changed.
+        """
+        render_cache.tick()
+        changed = [widget.refresh_headers()
+                   for widget in self._timeline_widgets.values()]
+        return any(changed)
+
+    def invalidate_timelines(self):
+        """
+        Discard the widgets built for the visible timelines, they will be
+        created again with the current configuration on the next draw.
+        """
+        render_cache.invalidate()
+        for widget in self._timeline_widgets.values():
+            widget.detach()
+        self._timeline_widgets = {}
+        if isinstance(self.frame.body, TimelinesBuffer):
+            self.frame.body = TimelinesBuffer()
+
+    def invalidate_status(self, status):
+        """
+        Discard what has been rendered for `status`, it will be rendered
+        again the next time it is shown.
+        """
+        render_cache.invalidate(status)
+        for widget in self._timeline_widgets.values():
+            widget.body.discard(status)
 
     def show_info(self):
         self.frame.header.clear()
@@ -791,16 +772,17 @@ class ScrollableListBox(ListBox, Scrollable):
         """
         Arguments:
 
-        `contents` is a list with the elements contained in the
-        `ScrollableListBox`.
+        `contents` is a list or a ``urwid.ListWalker`` with the elements
+        contained in the `ScrollableListBox`.
 
         `offset` is the number of position that `scroll_up` and `scroll_down`
         shift the cursor.
         """
         self.offset = offset
 
-        ListBox.__init__(self,
-                         SimpleListWalker(contents))
+        if not isinstance(contents, ListWalker):
+            contents = SimpleListWalker(contents)
+        ListBox.__init__(self, contents)
 
     def scroll_up(self):
         focus_status, pos = self.get_focus()
@@ -929,21 +911,30 @@ class TimelinesBuffer(ScrollableWidgetWrap):
     Another widget can be placed on top of it.
     """
 
-    def __init__(self, timelines=None, **kwargs):
-        timelines = [] if timelines is None else timelines
+    def __init__(self, timelines=None, timeline_widgets=None, **kwargs):
+        if timeline_widgets is None:
+            timelines = [] if timelines is None else timelines
+            timeline_widgets = [TimelineWidget(timeline, **kwargs)
+                                for timeline in timelines]
 
-        widget = self._build_widget(timelines, **kwargs)
+        self.timeline_widgets = timeline_widgets
 
-        ScrollableWidgetWrap.__init__(self, widget)
-
-    def _build_widget(self, timelines, **kwargs):
-        timeline_widgets = [TimelineWidget(timeline, **kwargs)
-                            for timeline in timelines]
-        return Columns(timeline_widgets)
+        ScrollableWidgetWrap.__init__(self, Columns(timeline_widgets))
 
     def render_timelines(self, timelines, **kwargs):
         """Render the given statuses."""
-        self._w = self._build_widget(timelines, **kwargs)
+        self.set_timeline_widgets([TimelineWidget(timeline, **kwargs)
+                                   for timeline in timelines])
+
+    def set_timeline_widgets(self, timeline_widgets):
+        """
+        Display `timeline_widgets`, the columns are only rebuilt if they
+        changed.
+        """
+        if timeline_widgets == self.timeline_widgets:
+            return
+        self.timeline_widgets = timeline_widgets
+        self._w = Columns(timeline_widgets)
 
     @property
     def columns(self):
@@ -993,16 +984,245 @@ class TimelinesBuffer(ScrollableWidgetWrap):
         return key
 
 
+class TimelineWalker(ListWalker):
+    """
+    A ``urwid.ListWalker`` over a :class:`~turses.models.Timeline` that
+    builds the :class:`StatusWidget` of a status when it is about to be
+    rendered.
+
+    The last `cache_size` widgets built are kept in a LRU cache.
+    """
+
+    def __init__(self, timeline, cache_size=STATUS_WIDGET_CACHE_SIZE):
+        self.timeline = timeline
+        self.cache_size = cache_size
+        self.focus = 0
+        self._widgets = OrderedDict()
+
+    def __len__(self):
+        return len(self.timeline)
+
+    def __getitem__(self, position):
+        if position < 0:
+            raise IndexError(position)
+
+        status = self.timeline[position]
+        widget = self._widgets.get(status.id)
+        if widget is None:
+            widget = StatusWidget(status)
+            self._widgets[status.id] = widget
+            if len(self._widgets) > self.cache_size:
+                self._widgets.popitem(last=False)
+        else:
+            self._widgets.move_to_end(status.id)
+        return widget
+
+    def discard(self, status):
+        """Forget the widget built for `status`, if any."""
+        if self._widgets.pop(status.id, None) is not None:
+            self._modified()
+
+    def next_position(self, position):
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position)
+        return position - 1
+
+    def positions(self, reverse=False):
+        positions = range(len(self))
+        return reversed(positions) if reverse else positions
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def refresh(self):
+        """Let the list box know that the timeline has changed."""
+        last = len(self) - 1
+        if self.focus > last:
+            self.focus = max(last, 0)
+        self._modified()
+
+    def refresh_headers(self):
+        """
+        Refresh the headers of the widgets built, which include the ones
+        being displayed, returning whether any of them changed.
+        """
+        changed = False
+        for widget in self._widgets.values():
+            if widget.refresh_header():
+                changed = True
+        if changed:
+            self._modified()
+        return changed
+
+
 class TimelineWidget(ScrollableListBox):
     """
     A :class:`ScrollableListBox` containing a list of Twitter statuses, each of
     which is rendered as a :class:`StatusWidget`.
+
+    The statuses are read from the timeline through a :class:`TimelineWalker`,
+    so only the widgets of the statuses that are rendered are built. The widget
+    observes its timeline (as a :class:`~turses.meta.Observer` would) and
+    refreshes the list box when synchronized after a change.
     """
 
     def __init__(self, timeline=None):
-        statuses = timeline if timeline else []
-        status_widgets = [StatusWidget(status) for status in statuses]
-        ScrollableListBox.__init__(self, status_widgets)
+        self.timeline = timeline if timeline is not None else []
+        self._outdated = False
+
+        ScrollableListBox.__init__(self, TimelineWalker(self.timeline))
+
+        if isinstance(self.timeline, Observable):
+            self.timeline.subscribe(self)
+
+    def update(self):
+        """Called when the timeline changes."""
+        self._outdated = True
+
+    def sync(self):
+        """Bring the list box up to date with the timeline."""
+        if not self._outdated:
+            return
+        self._outdated = False
+        self.body.refresh()
+
+    def refresh_headers(self):
+        """Refresh the headers of the statuses being displayed."""
+        return self.body.refresh_headers()
+
+    def detach(self):
+        """Stop observing the timeline."""
+        if isinstance(self.timeline, Observable):
+            self.timeline.unsubscribe(self)
+
+
+class RenderCache(object):
+    """
+    Memoise the text processing needed for rendering statuses: the header and
+    the body markup with attributes are computed once per status.
+
+    Entries are keyed by status id and the generation of the styles they were
+    rendered with, which is bumped with :meth:`invalidate` when the
+    configuration changes. Headers include the relative creation time of the
+    status, computed against the time of the last :meth:`tick` so that every
+    status rendered in a frame shares it, and are only rebuilt when that time
+    would read differently.
+    """
+
+    def __init__(self, size=RENDER_CACHE_SIZE, clock=time):
+        self.size = size
+        self.clock = clock
+        self.generation = 0
+        self.now = clock()
+        self._entries = OrderedDict()
+
+    def _key(self, status):
+        return (is_DM(status), status.id, self.generation)
+
+    def tick(self):
+        """Take a snapshot of the current time for rendering the headers."""
+        self.now = self.clock()
+
+    def get(self, status):
+        """Return a tuple with the header and the body markup of `status`."""
+        key = self._key(status)
+        entry = self._entries.get(key)
+        if entry is None:
+            relative_created_at, expires = relative_time(status.created_at,
+                                                         self.now)
+            text = map_attributes(status,
+                                  hashtag='hashtag',
+                                  attag='attag',
+                                  url='url')
+            entry = [expires,
+                     create_header(status, relative_created_at),
+                     text]
+            self._entries[key] = entry
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+            if self.now >= entry[0]:
+                relative_created_at, entry[0] = relative_time(
+                    status.created_at, self.now)
+                entry[1] = create_header(status, relative_created_at)
+        return entry[1], entry[2]
+
+    def invalidate(self, status=None):
+        """
+        Discard the entry of `status` or, when no `status` is given, every
+        entry rendered with the current styles.
+        """
+        if status is None:
+            self.generation += 1
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(status), None)
+
+
+render_cache = RenderCache()
+
+
+def create_header(status, relative_created_at=None):
+    """
+    Return the header text for `status`, posted `relative_created_at` (now if
+    not given).
+    """
+    if relative_created_at is None:
+        relative_created_at = status.relative_created_at
+
+    if is_DM(status):
+        return _dm_header(status, relative_created_at)
+
+    reply = ''
+    retweeted = ''
+    retweet_count = ''
+    retweeter = ''
+    username = status.user
+
+    # reply
+    if status.is_reply:
+        reply = surround_with_spaces(
+            configuration.styles['reply_indicator'])
+
+    # retweet
+    if status.is_retweet:
+        retweeted = surround_with_spaces(
+            configuration.styles['retweet_indicator'])
+        # `username` is the author of the original tweet
+        username = status.author
+        # `retweeter` is the user who made the RT
+        retweeter = status.user
+        retweet_count = str(status.retweet_count)
+
+    # create header
+    styles = configuration.styles
+    header_template = ' ' + styles.get('header_template') + ' '
+    header = str(header_template).format(
+        username=username,
+        retweeted=retweeted,
+        retweeter=retweeter,
+        time=relative_created_at,
+        reply=reply,
+        retweet_count=retweet_count,
+    )
+
+    return encode(header)
+
+
+def _dm_header(dm, relative_created_at):
+    dm_template = ''.join([' ', configuration.styles['dm_template'], ' '])
+    header = str(dm_template).format(
+        sender_screen_name=dm.sender_screen_name,
+        recipient_screen_name=dm.recipient_screen_name,
+        time=relative_created_at,
+    )
+
+    return encode(header)
 
 
 class StatusWidget(WidgetWrap):
@@ -1011,26 +1231,34 @@ class StatusWidget(WidgetWrap):
     def __init__(self, status):
         self.status = status
 
-        header_text = self._create_header(status)
-        text = map_attributes(status,
-                              hashtag='hashtag',
-                              attag='attag',
-                              url='url')
+        self.header_text, text = render_cache.get(status)
 
         is_favorite = not is_DM(status) and status.is_favorite
-        widget = self._build_widget(header_text, text, is_favorite)
+        widget = self._build_widget(self.header_text, text, is_favorite)
 
         self.__super.__init__(widget)
 
+    def refresh_header(self):
+        """
+        Rebuild the widget if the header of the status changed since it was
+        built, returning whether it did.
+        """
+        header_text, text = render_cache.get(self.status)
+        if header_text == self.header_text:
+            return False
+
+        self.header_text = header_text
+        is_favorite = not is_DM(self.status) and self.status.is_favorite
+        self._w = self._build_widget(header_text, text, is_favorite)
+        return True
+
     def _build_widget(self, header_text, text, favorite=False):
         """Return the wrapped widget."""
         box_around_status = configuration.styles.get('box_around_status', True)
         divider = configuration.styles.get('status_divider', False)
 
         header = AttrMap(Text(header_text), 'header')
-        sanitized_text = ([sanitize(t) for t in text]
-                          if isinstance(text, list) else sanitize(text))
-        body = Padding(AttrMap(Text(sanitized_text), 'body'), left=1, right=1)
+        body = Padding(AttrMap(Text(text), 'body'), left=1, right=1)
 
         border_attr = 'line'
         if favorite:
@@ -1063,60 +1291,6 @@ class StatusWidget(WidgetWrap):
     def keypress(self, size, key):
         return key
 
-    def _create_header(self, status):
-        """
-        Return the header text for the status associated with this widget.
-        """
-        if is_DM(status):
-            return self._dm_header(status)
-
-        reply = ''
-        retweeted = ''
-        retweet_count = ''
-        retweeter = ''
-        username = status.user
-        relative_created_at = status.relative_created_at
-
-        # reply
-        if status.is_reply:
-            reply = surround_with_spaces(
-                configuration.styles['reply_indicator'])
-
-        # retweet
-        if status.is_retweet:
-            retweeted = surround_with_spaces(
-                configuration.styles['retweet_indicator'])
-            # `username` is the author of the original tweet
-            username = status.author
-            # `retweeter` is the user who made the RT
-            retweeter = status.user
-            retweet_count = str(status.retweet_count)
-
-        # create header
-        styles = configuration.styles
-        header_template = ' ' + styles.get('header_template') + ' '
-        header = str(header_template).format(
-            username=username,
-            retweeted=retweeted,
-            retweeter=retweeter,
-            time=relative_created_at,
-            reply=reply,
-            retweet_count=retweet_count,
-        )
-
-        return encode(header)
-
-    def _dm_header(self, dm):
-        dm_template = ''.join([' ', configuration.styles['dm_template'], ' '])
-        relative_created_at = dm.relative_created_at
-        header = str(dm_template).format(
-            sender_screen_name=dm.sender_screen_name,
-            recipient_screen_name=dm.recipient_screen_name,
-            time=relative_created_at,
-        )
-
-        return encode(header)
-
 
 class BoxDecoration(WidgetDecoration, WidgetWrap):
     """Draw a box around `original_widget`."""
@@ -1222,22 +1396,3 @@ class UserInfo(WidgetWrap, metaclass=signals.MetaSignals):
         super(UserInfo, self).__init__(
             LineBox(title='@{0}'.format(user.screen_name),
                     original_widget=pile))
-
-
-def sanitize(text):
-    if isinstance(text, str):
-        return html_unescape(text)
-    else:
-        return text
-
-
-def html_unescape(string):
-    """Unescape HTML entities from ``string``."""
-    def entity_replacer(m):
-        entity = m.group(1)
-        if entity in entitydefs:
-            return entitydefs[entity]
-        else:
-            return m.group(0)
-
-    return re.sub(r'&([^;]+);', entity_replacer, string)